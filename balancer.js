@@ -4,63 +4,64 @@
 
 import { Digraph } from './graphviz-builder.js';
 
+// node attributes are the same for every node of a kind, so they are shared
+// instead of rebuilt per node
+const _INPUT_NODE_ATTRS = { shape: "box", style: "filled", fillcolor: "lightgreen" };
+const _OUTPUT_NODE_ATTRS = { shape: "box", style: "filled", fillcolor: "lightblue" };
+const _SPLITTER_NODE_ATTRS = { shape: "diamond", style: "filled", fillcolor: "lightyellow" };
+const _MERGER_NODE_ATTRS = { shape: "diamond", style: "filled", fillcolor: "lightcoral" };
+
 // ============================================================================
-// Helper utilities
+// Flow assignment functions
 // ============================================================================
 
 /**
- * Create a nested defaultdict-like object.
- * Returns a Proxy that auto-creates nested objects on access.
+ * Sum a list of flow rates.
+ * 
+ * Precondition:
+ *     flows is a list of numbers
+ * 
+ * Postcondition:
+ *     returns the sum of flows, accumulated in list order
+ * 
+ * @param {Array<number>} flows - flow rates to sum
+ * @returns {number} total flow
  */
-function createNestedDefaultDict() {
-    const handler = {
-        get: (target, prop) => {
-            if (!(prop in target)) {
-                target[prop] = {};
-            }
-            return target[prop];
-        }
-    };
-    return new Proxy({}, handler);
+function _total_flow(flows) {
+    let total = 0;
+    for (let idx = 0; idx < flows.length; idx++) {
+        total += flows[idx];
+    }
+    return total;
 }
 
-// ============================================================================
-// Flow assignment functions
-// ============================================================================
-
 /**
  * Assign flow from a single input to an output.
  * 
  * Precondition:
  *     in_flow > 0
  *     remaining > 0
- *     flow_matrix is a nested defaultdict
- *     available_inputs is a list of [input_idx, flow] tuples
+ *     flow_matrix maps input_idx -> {output_idx -> flow}
  * 
  * Postcondition:
+ *     flow_matrix[in_idx] is created if missing
  *     flow_matrix[in_idx][out_idx] is updated with the assigned flow
- *     if input is not fully consumed, remainder is added back to available_inputs
- *     returns the new remaining requirement after assignment
+ *     returns the assigned flow, min(in_flow, remaining)
  * 
  * @param {number} in_idx - index of the input being assigned
  * @param {number} in_flow - available flow from this input
  * @param {number} remaining - remaining flow requirement for the output
  * @param {number} out_idx - index of the output being satisfied
  * @param {Object<number, Object<number, number>>} flow_matrix - nested dict tracking assignments
- * @param {Array<[number, number]>} available_inputs - list of available inputs (mutated if input not fully consumed)
- * @returns {number} remaining flow requirement after this assignment
+ * @returns {number} flow assigned from this input to the output
  */
-function _consume_input_flow(in_idx, in_flow, remaining, out_idx, flow_matrix, available_inputs) {
-    if (in_flow <= remaining) {
-        // input fully consumed
-        flow_matrix[in_idx][out_idx] = in_flow;
-        return remaining - in_flow;
-    } else {
-        // input partially consumed, return remainder to available inputs
-        flow_matrix[in_idx][out_idx] = remaining;
-        available_inputs.unshift([in_idx, in_flow - remaining]);
-        return 0;
+function _consume_input_flow(in_idx, in_flow, remaining, out_idx, flow_matrix) {
+    const assigned = Math.min(in_flow, remaining);
+    if (!flow_matrix[in_idx]) {
+        flow_matrix[in_idx] = {};
     }
+    flow_matrix[in_idx][out_idx] = assigned;
+    return assigned;
 }
 
 /**
@@ -71,31 +72,49 @@ function _consume_input_flow(in_idx, in_flow, remaining, out_idx, flow_matrix, a
  *     outputs is a list of positive integers representing output requirements
  * 
  * Postcondition:
- *     returns a nested dict where flow_matrix[input_idx][output_idx] = flow_amount
+ *     returns [flow_matrix, output_sources]
+ *     flow_matrix[input_idx][output_idx] = flow_amount
+ *     output_sources[output_idx] lists [input_idx, flow_amount] in input order
  *     sum of assigned flows from each input <= original input flow
  *     flows are assigned greedily in output order
  * 
  * @param {Array<number>} inputs - list of input flow rates
  * @param {Array<number>} outputs - list of output flow requirements
- * @returns {Object<number, Object<number, number>>} flow_matrix[input_idx][output_idx] = flow_amount
+ * @returns {[Object<number, Object<number, number>>, Array<Array<[number, number]>>]} [flow_matrix, output_sources]
  */
 function _assign_flows(inputs, outputs) {
-    const flow_matrix = createNestedDefaultDict();
-    const available_inputs = inputs.map((flow, idx) => [idx, flow]);
+    const flow_matrix = {};
+    const output_sources = [];
+    // unconsumed flow per input; inputs before next_input are fully consumed,
+    // so advancing the cursor replaces shift()/unshift() on a shrinking list.
+    // A typed array keeps the two-pointer walk on unboxed doubles.
+    const available_flows = Float64Array.from(inputs);
+    let next_input = 0;
 
     for (let out_idx = 0; out_idx < outputs.length; out_idx++) {
         const required_flow = outputs[out_idx];
         let remaining = required_flow;
+        const sources = [];
+        output_sources.push(sources);
 
-        while (remaining > 0 && available_inputs.length > 0) {
-            const [in_idx, in_flow] = available_inputs.shift();
-            remaining = _consume_input_flow(
-                in_idx, in_flow, remaining, out_idx, flow_matrix, available_inputs
+        while (remaining > 0 && next_input < available_flows.length) {
+            const in_flow = available_flows[next_input];
+            const assigned = _consume_input_flow(
+                next_input, in_flow, remaining, out_idx, flow_matrix
             );
+            remaining -= assigned;
+            sources.push([next_input, assigned]);
+            if (assigned === in_flow) {
+                // input fully consumed
+                next_input += 1;
+            } else {
+                // input partially consumed, remainder stays at the front
+                available_flows[next_input] = in_flow - assigned;
+            }
         }
     }
 
-    return flow_matrix;
+    return [flow_matrix, output_sources];
 }
 
 // ============================================================================
@@ -120,27 +139,11 @@ function _assign_flows(inputs, outputs) {
  */
 function _add_io_nodes(dot, inputs, outputs) {
     for (let idx = 0; idx < inputs.length; idx++) {
-        dot.node(
-            `I${idx}`,
-            `Input ${idx}`,
-            {
-                shape: "box",
-                style: "filled",
-                fillcolor: "lightgreen"
-            }
-        );
+        dot.node(`I${idx}`, `Input ${idx}`, _INPUT_NODE_ATTRS);
     }
 
     for (let idx = 0; idx < outputs.length; idx++) {
-        dot.node(
-            `O${idx}`,
-            `Output ${idx}`,
-            {
-                shape: "box",
-                style: "filled",
-                fillcolor: "lightblue"
-            }
-        );
+        dot.node(`O${idx}`, `Output ${idx}`, _OUTPUT_NODE_ATTRS);
     }
 }
 
@@ -183,37 +186,30 @@ function _connect_child_to_splitter(child_id, child_dests, splitter_id, dest_sou
  * 
  * Precondition:
  *     roots is a list of [node_id, destinations_dict] tuples
- *     group_size is a positive integer <= len(roots)
- *     device_counter is a single-element list containing next device ID number
+ *     start + group_size <= len(roots)
+ *     splitter_id is a device ID not yet used in dot
  *     dot is a Graphviz Digraph
  *     dest_sources tracks destination sources
  * 
  * Postcondition:
  *     a new splitter node is added to dot
- *     device_counter[0] is incremented
  *     returns [splitter_id, merged_destinations_dict]
  *     dest_sources may be mutated if group contains leaf nodes
  * 
  * @param {Array<[string, Object<number, number>]>} roots - list of [node_id, destinations] tuples to group
+ * @param {number} start - index of the first root in the group
  * @param {number} group_size - number of roots to group together
- * @param {Array<number>} device_counter - mutable counter for generating unique device IDs
+ * @param {string} splitter_id - ID for the new splitter node
  * @param {Digraph} dot - Graphviz graph to add nodes/edges to
  * @param {Object<number, [string, number]>} dest_sources - dict tracking which node feeds each destination
  * @returns {[string, Object<number, number>]} [splitter_id, merged_destinations_dict]
  */
-function _group_roots_into_splitter(roots, group_size, device_counter, dot, dest_sources) {
-    const group = roots.slice(0, group_size);
-
-    const splitter_id = `S${device_counter[0]}`;
-    device_counter[0] += 1;
-    dot.node(splitter_id, "", {
-        shape: "diamond",
-        style: "filled",
-        fillcolor: "lightyellow"
-    });
+function _group_roots_into_splitter(roots, start, group_size, splitter_id, dot, dest_sources) {
+    dot.node(splitter_id, "", _SPLITTER_NODE_ATTRS);
 
     const merged_dests = {};
-    for (const [child_id, child_dests] of group) {
+    for (let idx = start; idx < start + group_size; idx++) {
+        const [child_id, child_dests] = roots[idx];
         _connect_child_to_splitter(child_id, child_dests, splitter_id, dest_sources, dot);
         Object.assign(merged_dests, child_dests);
     }
@@ -226,24 +222,28 @@ function _group_roots_into_splitter(roots, group_size, device_counter, dot, dest
  * 
  * Precondition:
  *     out_idx is a valid output index
- *     flow_matrix maps input_idx -> {output_idx -> flow}
- *     input_outputs maps input_idx -> {output_idx -> [node_id, flow]}
+ *     output_sources[out_idx] lists the [input_idx, flow] pairs feeding this output
+ *     input_outputs maps input_idx -> {output_idx -> [node_id, flow]} for inputs with a split tree
  * 
  * Postcondition:
  *     returns dict mapping source_node_id -> flow_amount for this output
+ *     inputs without a split tree feed the output straight from their input node
  * 
  * @param {number} out_idx - index of the output to collect sources for
- * @param {Object<number, Object<number, number>>} flow_matrix - flow assignments from inputs to outputs
+ * @param {Array<Array<[number, number]>>} output_sources - inputs feeding each output, recorded during flow assignment
  * @param {Object<number, Object<number, [string, number]>>} input_outputs - mapping of split tree results
  * @returns {Object<string, number>} dict mapping source node IDs to flow amounts feeding this output
  */
-function _collect_sources_for_output(out_idx, flow_matrix, input_outputs) {
+function _collect_sources_for_output(out_idx, output_sources, input_outputs) {
     const sources = {};
-    for (const in_idx in flow_matrix) {
-        const out_flows = flow_matrix[in_idx];
-        if (out_idx in out_flows) {
-            const [source_node, flow] = input_outputs[in_idx][out_idx];
-            sources[source_node] = flow;
+    for (const [in_idx, flow] of output_sources[out_idx]) {
+        const split_outputs = input_outputs[in_idx];
+        if (split_outputs === undefined) {
+            // this output is the input's only destination
+            sources[`I${in_idx}`] = flow;
+        } else {
+            const [source_node, split_flow] = split_outputs[out_idx];
+            sources[source_node] = split_flow;
         }
     }
     return sources;
@@ -254,7 +254,7 @@ function _collect_sources_for_output(out_idx, flow_matrix, input_outputs) {
  * 
  * Precondition:
  *     out_idx is a valid output index
- *     flow_matrix contains flow assignments
+ *     output_sources lists the inputs feeding each output
  *     input_outputs contains split tree results
  *     build_merge_tree_func is a callable that builds merge trees
  *     dot is a Graphviz Digraph
@@ -265,13 +265,13 @@ function _collect_sources_for_output(out_idx, flow_matrix, input_outputs) {
  *     multiple sources create merge tree
  * 
  * @param {number} out_idx - index of the output to connect
- * @param {Object<number, Object<number, number>>} flow_matrix - flow assignments from inputs to outputs
+ * @param {Array<Array<[number, number]>>} output_sources - inputs feeding each output
  * @param {Object<number, Object<number, [string, number]>>} input_outputs - split tree results
  * @param {Function} build_merge_tree_func - function to build merge trees
  * @param {Digraph} dot - Graphviz graph
  */
-function _connect_output(out_idx, flow_matrix, input_outputs, build_merge_tree_func, dot) {
-    const sources = _collect_sources_for_output(out_idx, flow_matrix, input_outputs);
+function _connect_output(out_idx, output_sources, input_outputs, build_merge_tree_func, dot) {
+    const sources = _collect_sources_for_output(out_idx, output_sources, input_outputs);
 
     if (Object.keys(sources).length === 1) {
         // direct connection - no merge needed
@@ -310,8 +310,8 @@ function _connect_output(out_idx, flow_matrix, input_outputs, build_merge_tree_f
  */
 function design_balancer(inputs, outputs) {
     // check feasibility
-    const total_inputs = inputs.reduce((a, b) => a + b, 0);
-    const total_outputs = outputs.reduce((a, b) => a + b, 0);
+    const total_inputs = _total_flow(inputs);
+    const total_outputs = _total_flow(outputs);
     if (total_inputs !== total_outputs) {
         throw new Error(
             `Total input flow ${total_inputs} must equal total output flow ${total_outputs}`
@@ -319,7 +319,7 @@ function design_balancer(inputs, outputs) {
     }
 
     // Phase 1: Flow assignment
-    const flow_matrix = _assign_flows(inputs, outputs);
+    const [flow_matrix, output_sources] = _assign_flows(inputs, outputs);
 
     // Phase 2: Build graph with optimal split/merge trees
     const dot = new Digraph();
@@ -327,7 +327,7 @@ function design_balancer(inputs, outputs) {
 
     _add_io_nodes(dot, inputs, outputs);
 
-    const device_counter = [0];  // use list for mutability in nested function
+    let next_device_id = 0;  // shared by splitters and mergers in the nested builders
 
     /**
      * Build optimal split tree for one source feeding multiple destinations.
@@ -343,8 +343,13 @@ function design_balancer(inputs, outputs) {
             return { [dest_id]: [source_id, flow] };
         }
 
-        // Sort destinations for consistent output
-        const destinations = Object.entries(flows_dict).sort((a, b) => {
+        // Sort destinations for consistent output. Keys are converted to
+        // numbers once so the comparator does no string coercion.
+        const destinations = [];
+        for (const dest_id in flows_dict) {
+            destinations.push([Number(dest_id), flows_dict[dest_id]]);
+        }
+        destinations.sort((a, b) => {
             // Sort by flow (descending), then by dest_id (descending)
             if (a[1] !== b[1]) {
                 return b[1] - a[1];  // descending by flow
@@ -361,18 +366,26 @@ function design_balancer(inputs, outputs) {
         // Track which actual node feeds each destination
         const dest_sources = {};
 
-        // Group roots together until only one remains
-        while (roots.length > 1) {
-            const group_size = roots.length >= 3 ? 3 : 2;
+        // Group roots together until only one remains. Each 3-way splitter
+        // removes two roots and a 2-way splitter removes one, so the counts
+        // are known up front: a single 2-way splitter finishes an even count.
+        const extra = roots.length - 1;
+        const num_3way = Math.floor(extra / 2);
+        const num_splitters = num_3way + extra % 2;
+        // roots is used as a queue; next_root skips past grouped entries
+        // instead of splicing them off the front
+        let next_root = 0;
+        for (let i = 0; i < num_splitters; i++) {
+            const group_size = i < num_3way ? 3 : 2;
             const [splitter_id, merged_dests] = _group_roots_into_splitter(
-                roots, group_size, device_counter, dot, dest_sources
+                roots, next_root, group_size, `S${next_device_id++}`, dot, dest_sources
             );
-            roots.splice(0, group_size);
+            next_root += group_size;
             roots.push([splitter_id, merged_dests]);
         }
 
         // Now we have one root - connect it to the source
-        const [root_id, root_dests] = roots[0];
+        const [root_id, root_dests] = roots[next_root];
         const root_flow = Object.values(root_dests).reduce((a, b) => a + b, 0);
         dot.edge(source_id, root_id, { label: String(root_flow) });
 
@@ -402,46 +415,51 @@ function design_balancer(inputs, outputs) {
             if (a[1] !== b[1]) {
                 return b[1] - a[1];  // descending by flow
             }
-            return b[0].localeCompare(a[0]) * -1;  // descending by source_id
+            // ascending by source_id; node IDs are ASCII, so a plain
+            // comparison orders them the same as localeCompare did
+            return a[0] < b[0] ? -1 : (a[0] > b[0] ? 1 : 0);
         });
-        const streams = [...sources];
-
-        // Merge streams until we have just one
-        while (streams.length > 1) {
-            const group_size = streams.length >= 3 ? 3 : 2;
-            const to_merge = streams.slice(0, group_size);
-            streams.splice(0, group_size);
-
-            const merger_id = `M${device_counter[0]}`;
-            device_counter[0] += 1;
+        // sources is used as a queue; next_stream skips past merged entries
+        // instead of splicing them off the front
+        const streams = sources;
+        let next_stream = 0;
+
+        // Merge streams until we have just one. As with splitters, the
+        // merger counts follow from the source count alone.
+        const extra = streams.length - 1;
+        const num_3way = Math.floor(extra / 2);
+        const num_mergers = num_3way + extra % 2;
+        for (let i = 0; i < num_mergers; i++) {
+            const group_size = i < num_3way ? 3 : 2;
+            const to_merge = streams.slice(next_stream, next_stream + group_size);
+            next_stream += group_size;
+
+            const merger_id = `M${next_device_id++}`;
             const merge_flow = to_merge.reduce((sum, [_, flow]) => sum + flow, 0);
-            dot.node(
-                merger_id,
-                "",
-                {
-                    shape: "diamond",
-                    style: "filled",
-                    fillcolor: "lightcoral"
-                }
-            );
+            dot.node(merger_id, "", _MERGER_NODE_ATTRS);
             for (const [source_id, flow] of to_merge) {
                 dot.edge(source_id, merger_id, { label: String(flow) });
             }
             streams.push([merger_id, merge_flow]);
         }
 
-        return streams[0][0];
+        return streams[next_stream][0];
     }
 
-    // Build split trees for each input
+    // Build split trees for each input that feeds more than one output.
+    // Single-destination inputs are left out and connected directly, so
+    // chain-like graphs skip the tree builder entirely.
     const input_outputs = {};  // {input_idx: {output_idx: [source_node_id, flow]}}
     for (const in_idx in flow_matrix) {
-        input_outputs[in_idx] = build_split_tree(`I${in_idx}`, flow_matrix[in_idx]);
+        const out_flows = flow_matrix[in_idx];
+        if (Object.keys(out_flows).length > 1) {
+            input_outputs[in_idx] = build_split_tree(`I${in_idx}`, out_flows);
+        }
     }
 
     // Build merge trees for each output and create final edges
     for (let out_idx = 0; out_idx < outputs.length; out_idx++) {
-        _connect_output(out_idx, flow_matrix, input_outputs, build_merge_tree, dot);
+        _connect_output(out_idx, output_sources, input_outputs, build_merge_tree, dot);
     }
 
     return dot;
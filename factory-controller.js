@@ -4,7 +4,7 @@
  */
 
 import { design_factory, rebuild_graphviz_from_recipe_counts } from './factory.js';
-import { parse_material_rate } from './parsing-utils.js';
+import { parse_material_rates } from './parsing-utils.js';
 import { get_all_recipes_by_machine, get_recipes_for, get_default_enablement_set, _SCHEMATIC_RECIPES_LOOKUP } from './recipes.js';
 import { RECIPE_INDEX_V1, RECIPE_TO_INDEX_V1 } from './recipe-index-v1.js';
 
@@ -1176,16 +1176,15 @@ class FactoryController {
      * @throws {Error} if parsing fails for any line
      */
     static parse_config_text(text) {
-        const items = [];
+        const lines = [];
         for (const line of text.trim().split("\n")) {
             const trimmed = line.trim();
             if (!trimmed || trimmed.startsWith("#")) {
                 continue;
             }
-            const [material, rate] = parse_material_rate(trimmed);
-            items.push([material, rate]);
+            lines.push(trimmed);
         }
-        return items;
+        return parse_material_rates(lines);
     }
     
     /**
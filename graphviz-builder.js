@@ -75,33 +75,48 @@ class Subgraph {
      * @returns {string} DOT representation
      */
     _toDot(indent = '  ') {
-        let output = `${indent}subgraph ${this.name} {\n`;
+        return this._appendDot([], indent).join('');
+    }
+
+    /**
+     * Append this subgraph's DOT lines, each ending in a newline, to an array.
+     * Nested subgraphs and the root graph share one array so the text is
+     * joined once.
+     * @param {Array<string>} output - array the DOT lines are pushed onto
+     * @param {string} indent - indentation string
+     * @returns {Array<string>} output, for chaining
+     */
+    _appendDot(output, indent = '  ') {
+        output.push(`${indent}subgraph ${this.name} {\n`);
         const innerIndent = indent + '  ';
-        
-        // Add subgraph attributes
+
+        // resolve the root helpers once for the whole subgraph
         const escapeFunc = this._getEscapeFunc();
+        const quoteFunc = this._getQuoteIdFunc();
+
+        // Add subgraph attributes
         for (const [key, value] of Object.entries(this.graphAttrs)) {
             // Escape and quote string values
             const formattedValue = typeof value === 'string' ? `"${escapeFunc(value)}"` : value;
-            output += `${innerIndent}${key}=${formattedValue}\n`;
+            output.push(`${innerIndent}${key}=${formattedValue}\n`);
         }
         
         // Add nodes
         for (const node of this.nodes) {
-            output += this._formatNode(node, innerIndent);
+            output.push(this._formatNode(node, innerIndent, escapeFunc, quoteFunc));
         }
         
         // Add nested subgraphs
         for (const sub of this.subgraphs) {
-            output += sub._toDot(innerIndent);
+            sub._appendDot(output, innerIndent);
         }
         
         // Add edges
         for (const edge of this.edges) {
-            output += this._formatEdge(edge, innerIndent);
+            output.push(this._formatEdge(edge, innerIndent, escapeFunc, quoteFunc));
         }
         
-        output += `${indent}}\n`;
+        output.push(`${indent}}\n`);
         return output;
     }
 
@@ -109,11 +124,12 @@ class Subgraph {
      * Format a node as DOT string.
      * @param {Object<string, *>} node - node object with id, label, and attributes
      * @param {string} indent - indentation string
+     * @param {Function} escapeFunc - string escaping function from the root graph
+     * @param {Function} quoteFunc - ID quoting function from the root graph
      * @returns {string} formatted node string
      */
-    _formatNode(node, indent) {
+    _formatNode(node, indent, escapeFunc = this._getEscapeFunc(), quoteFunc = this._getQuoteIdFunc()) {
         const attrs = [];
-        const escapeFunc = this._getEscapeFunc();
         if (node.label !== undefined) {
             attrs.push(`label="${escapeFunc(node.label)}"`);
         }
@@ -123,19 +139,19 @@ class Subgraph {
         if (node.color) attrs.push(`color=${node.color}`);
         
         const attrStr = attrs.length > 0 ? ` [${attrs.join(', ')}]` : '';
-        const quotedId = this._getQuoteIdFunc()(node.id);
-        return `${indent}${quotedId}${attrStr}\n`;
+        return `${indent}${quoteFunc(node.id)}${attrStr}\n`;
     }
 
     /**
      * Format an edge as DOT string.
      * @param {Object<string, *>} edge - edge object with from, to, and attributes
      * @param {string} indent - indentation string
+     * @param {Function} escapeFunc - string escaping function from the root graph
+     * @param {Function} quoteFunc - ID quoting function from the root graph
      * @returns {string} formatted edge string
      */
-    _formatEdge(edge, indent) {
+    _formatEdge(edge, indent, escapeFunc = this._getEscapeFunc(), quoteFunc = this._getQuoteIdFunc()) {
         const attrs = [];
-        const escapeFunc = this._getEscapeFunc();
         if (edge.label !== undefined) {
             // Escape and quote string labels
             const formattedLabel = typeof edge.label === 'string' ? `"${escapeFunc(edge.label)}"` : edge.label;
@@ -146,7 +162,6 @@ class Subgraph {
         if (edge.penwidth) attrs.push(`penwidth="${edge.penwidth}"`);
         
         const attrStr = attrs.length > 0 ? ` [${attrs.join(', ')}]` : '';
-        const quoteFunc = this._getQuoteIdFunc();
         return `${indent}${quoteFunc(edge.from)} -> ${quoteFunc(edge.to)}${attrStr}\n`;
     }
 
@@ -210,6 +225,10 @@ class Digraph {
      * @returns {string} escaped string
      */
     _escapeString(str) {
+        // most labels are plain text; skip the replace chain when nothing needs escaping
+        if (!/[\\"\n\r\t]/.test(str)) {
+            return str;
+        }
         return str.replace(/\\/g, '\\\\')
                   .replace(/"/g, '\\"')
                   .replace(/\n/g, '\\n')
@@ -284,11 +303,12 @@ class Digraph {
     get source() {
         // Quote the name if it contains spaces or special characters
         const quotedName = /[\s"]/.test(this.name) ? `"${this.name.replace(/"/g, '\\"')}"` : this.name;
-        let output = `digraph ${quotedName} {\n`;
+        // collect lines and join once rather than growing one string per node
+        const output = [`digraph ${quotedName} {\n`];
         
         // Add graph attributes
         for (const [key, value] of Object.entries(this.graphAttrs)) {
-            output += `  ${key}=${value}\n`;
+            output.push(`  ${key}=${value}\n`);
         }
         
         // Add nodes
@@ -305,12 +325,12 @@ class Digraph {
             if (node.color) attrs.push(`color=${node.color}`);
             
             const attrStr = attrs.length > 0 ? ` [${attrs.join(', ')}]` : '';
-            output += `  ${this._quoteId(node.id)}${attrStr}\n`;
+            output.push(`  ${this._quoteId(node.id)}${attrStr}\n`);
         }
         
         // Add subgraphs
         for (const sub of this.subgraphs) {
-            output += sub._toDot('  ');
+            sub._appendDot(output, '  ');
         }
         
         // Add edges
@@ -326,11 +346,11 @@ class Digraph {
             if (edge.penwidth) attrs.push(`penwidth="${edge.penwidth}"`);
             
             const attrStr = attrs.length > 0 ? ` [${attrs.join(', ')}]` : '';
-            output += `  ${this._quoteId(edge.from)} -> ${this._quoteId(edge.to)}${attrStr}\n`;
+            output.push(`  ${this._quoteId(edge.from)} -> ${this._quoteId(edge.to)}${attrStr}\n`);
         }
         
-        output += "}\n";
-        return output;
+        output.push("}\n");
+        return output.join('');
     }
 }
 
@@ -4,15 +4,80 @@
  */
 import { Graphviz } from 'https://cdn.jsdelivr.net/npm/@hpcc-js/wasm-graphviz@1.13.0/+esm';
 
-// Lazy-load graphviz instance (shared across all components)
-let graphvizInstance = null;
-async function getGraphviz() {
-    if (!graphvizInstance) {
-        graphvizInstance = await Graphviz.load();
+// Lazy-load graphviz instance (shared across all components). The pending
+// load is stored rather than its result, so viewers that render before the
+// wasm module finishes loading share one load instead of each starting one.
+let graphvizLoad = null;
+function getGraphviz() {
+    if (!graphvizLoad) {
+        graphvizLoad = Graphviz.load().catch(error => {
+            // allow a later render to retry a failed load
+            graphvizLoad = null;
+            throw error;
+        });
     }
-    return graphvizInstance;
+    return graphvizLoad;
 }
 
+// Laid-out SVG by DOT source (shared across all components); regenerating an
+// unchanged factory or switching back to a diagram skips the dot layout.
+// Map iteration order doubles as recency order, least recently used first.
+// Bounded both by entry count and by the total length of the cached source
+// and markup, since one large factory can outweigh many small diagrams.
+const svgCache = new Map();
+const SVG_CACHE_LIMIT = 32;
+const SVG_CACHE_CHAR_BUDGET = 32 * 1024 * 1024;
+let svgCacheChars = 0;
+
+/**
+ * Evict least recently used layouts until another entry of the given size fits
+ * @param {number} entryChars - combined length of the DOT source and SVG to be added
+ */
+function makeRoomInSvgCache(entryChars) {
+    while (svgCache.size > 0 &&
+           (svgCache.size >= SVG_CACHE_LIMIT || svgCacheChars + entryChars > SVG_CACHE_CHAR_BUDGET)) {
+        const [oldSource, oldSvg] = svgCache.entries().next().value;
+        svgCache.delete(oldSource);
+        svgCacheChars -= oldSource.length + oldSvg.length;
+    }
+}
+
+/**
+ * Lay out DOT source as SVG, reusing an earlier layout of identical source
+ * @param {string} dotSource - Graphviz DOT source string
+ * @returns {Promise<string>} SVG markup
+ */
+async function layoutSvg(dotSource) {
+    let svg = svgCache.get(dotSource);
+    if (svg !== undefined) {
+        // re-insert to mark as most recently used
+        svgCache.delete(dotSource);
+        svgCache.set(dotSource, svg);
+        return svg;
+    }
+    
+    const graphviz = await getGraphviz();
+    svg = graphviz.layout(dotSource, 'svg', 'dot');
+    const entryChars = dotSource.length + svg.length;
+    if (svgCache.has(dotSource) || entryChars > SVG_CACHE_CHAR_BUDGET) {
+        // another render cached it while this one waited, or it is too large to keep
+        return svg;
+    }
+    makeRoomInSvgCache(entryChars);
+    svgCache.set(dotSource, svg);
+    svgCacheChars += entryChars;
+    return svg;
+}
+
+// Zoom change per wheel notch (1.1^1, matching Python), precomputed in both
+// directions so wheel events do not call Math.pow
+const ZOOM_IN_FACTOR = 1.1;
+const ZOOM_OUT_FACTOR = 1 / 1.1;
+
+// Zoom limits, 0.35x to 2.0x (matching Python's -10 to 7 range)
+const MIN_ZOOM = 0.35;
+const MAX_ZOOM = 2.0;
+
 const GraphvizViewerComponent = {
     template: `
         <div class="graphviz-viewer">
@@ -62,9 +127,18 @@ const GraphvizViewerComponent = {
             scrollStartX: 0,
             scrollStartY: 0,
             svgNaturalWidth: 0,
-            svgNaturalHeight: 0
+            svgNaturalHeight: 0,
+            pendingZoomFactor: null,
+            zoomAnchorX: 0,
+            zoomAnchorY: 0,
+            renderGeneration: 0
         };
     },
+    created() {
+        // Rendered <svg> element, kept off the reactive data so Vue does not
+        // proxy the DOM node
+        this.svgElement = null;
+    },
     watch: {
         zoomFactor() {
             this.applySvgZoom();
@@ -73,6 +147,12 @@ const GraphvizViewerComponent = {
             handler(newSource) {
                 if (newSource) {
                     this.renderGraphviz(newSource);
+                } else {
+                    // cancel any render still waiting on its layout, since its
+                    // container goes away; the v-if container and its SVG are
+                    // removed with the source
+                    ++this.renderGeneration;
+                    this.clearRenderedSvg();
                 }
             },
             immediate: true
@@ -86,6 +166,9 @@ const GraphvizViewerComponent = {
         async renderGraphviz(dotSource) {
             if (!dotSource) return;
             
+            // Tag this request so a slower, older render cannot overwrite a newer one
+            const generation = ++this.renderGeneration;
+            
             // Wait for next tick to ensure DOM is updated
             await this.$nextTick();
             
@@ -96,10 +179,14 @@ const GraphvizViewerComponent = {
             }
             
             try {
-                // Get graphviz instance and render DOT to SVG
-                const graphviz = await getGraphviz();
-                const svg = await graphviz.layout(dotSource, 'svg', 'dot');
+                // Render DOT to SVG, or reuse the layout of identical source
+                const svg = await layoutSvg(dotSource);
+                if (generation !== this.renderGeneration) {
+                    // superseded while waiting for the layout; the latest request wins
+                    return false;
+                }
                 container.innerHTML = svg;
+                this.svgElement = container.querySelector('svg');
                 
                 // Update SVG dimensions for zoom calculations
                 this.updateSvgDimensions();
@@ -116,6 +203,10 @@ const GraphvizViewerComponent = {
                 return true;
             } catch (error) {
                 console.error('Graphviz rendering error:', error);
+                if (generation === this.renderGeneration) {
+                    // don't leave the previous graph, or its size, in place of the failed one
+                    this.clearRenderedSvg();
+                }
                 this.$emit('statusChange', { 
                     text: 'Graph rendering failed: ' + error.message, 
                     level: 'error' 
@@ -124,32 +215,71 @@ const GraphvizViewerComponent = {
             }
         },
         
+        /**
+         * Remove the rendered SVG and forget its element and dimensions
+         */
+        clearRenderedSvg() {
+            const container = this.$refs.svgContainer;
+            if (container) {
+                container.innerHTML = '';
+            }
+            this.svgElement = null;
+            this.svgNaturalWidth = 0;
+            this.svgNaturalHeight = 0;
+        },
+        
         /**
          * Handle mouse wheel zoom event
-         * Zooms centered on mouse cursor position
+         * Zooms centered on mouse cursor position. Wheel notches arriving
+         * within one animation frame are combined, so a fast scroll resizes
+         * the SVG and adjusts the scroll position once per frame.
          */
         handleZoom(event) {
             event.preventDefault();
             
+            if (!this.$refs.viewerContainer) return;
+            
+            // Remember the cursor in client coordinates; it is made relative to
+            // the container once per frame in applyPendingZoom
+            this.zoomAnchorX = event.clientX;
+            this.zoomAnchorY = event.clientY;
+            
+            // One zoom step per wheel notch, clamped per notch
+            const zoomChange = event.deltaY > 0 ? ZOOM_OUT_FACTOR : ZOOM_IN_FACTOR;
+            const firstInFrame = this.pendingZoomFactor === null;
+            const baseZoom = firstInFrame ? this.zoomFactor : this.pendingZoomFactor;
+            this.pendingZoomFactor = Math.max(MIN_ZOOM, Math.min(MAX_ZOOM, baseZoom * zoomChange));
+            
+            if (firstInFrame) {
+                requestAnimationFrame(() => this.applyPendingZoom());
+            }
+        },
+        
+        /**
+         * Apply the zoom accumulated by handleZoom since the last frame
+         */
+        applyPendingZoom() {
+            const newZoom = this.pendingZoomFactor;
+            this.pendingZoomFactor = null;
+            
             const container = this.$refs.viewerContainer;
-            if (!container) return;
+            if (!container || newZoom === null) return;
+            
+            // Wheeling further against a zoom limit changes nothing; skip the
+            // scroll adjustment and status update
+            if (newZoom === this.zoomFactor) return;
             
             // Get mouse position relative to container
             const rect = container.getBoundingClientRect();
-            const mouseX = event.clientX - rect.left;
-            const mouseY = event.clientY - rect.top;
+            const mouseX = this.zoomAnchorX - rect.left;
+            const mouseY = this.zoomAnchorY - rect.top;
             
             // Get scroll position before zoom
             const scrollX = container.scrollLeft;
             const scrollY = container.scrollTop;
             
-            // Calculate zoom delta (1.1^1 per wheel notch, matching Python)
-            const delta = event.deltaY > 0 ? -1 : 1;
             const oldZoom = this.zoomFactor;
-            const zoomChange = Math.pow(1.1, delta);
-            
-            // Clamp zoom between 0.35x and 2.0x (matching Python's -10 to 7 range)
-            this.zoomFactor = Math.max(0.35, Math.min(2.0, this.zoomFactor * zoomChange));
+            this.zoomFactor = newZoom;
             
             // Wait for size changes to apply, then adjust scroll position
             this.$nextTick(() => {
@@ -213,10 +343,7 @@ const GraphvizViewerComponent = {
          * Update stored SVG natural dimensions
          */
         updateSvgDimensions() {
-            const svgContainer = this.$refs.svgContainer;
-            if (!svgContainer) return;
-            
-            const svg = svgContainer.querySelector('svg');
+            const svg = this.svgElement;
             if (!svg) return;
             
             const viewBox = svg.viewBox.baseVal;
@@ -230,11 +357,9 @@ const GraphvizViewerComponent = {
          * Apply current zoom factor to SVG element
          */
         applySvgZoom() {
-            const svgContainer = this.$refs.svgContainer;
-            if (!svgContainer) return;
-            
-            const svg = svgContainer.querySelector('svg');
-            if (!svg || !this.svgNaturalWidth || !this.svgNaturalHeight) return;
+            const svg = this.svgElement;
+            // a detached element belongs to a container that has since been replaced
+            if (!svg || !svg.isConnected || !this.svgNaturalWidth || !this.svgNaturalHeight) return;
             
             // Set the SVG size directly (this affects both layout and visual)
             svg.setAttribute('width', this.svgNaturalWidth * this.zoomFactor);
@@ -246,21 +371,17 @@ const GraphvizViewerComponent = {
          */
         zoomToFit() {
             const container = this.$refs.viewerContainer;
-            const svgContainer = this.$refs.svgContainer;
-            if (!container || !svgContainer) return;
+            if (!container) return;
             
-            const svg = svgContainer.querySelector('svg');
-            if (!svg) return;
+            // SVG's natural dimensions, recorded when it was rendered
+            const svgWidth = this.svgNaturalWidth;
+            const svgHeight = this.svgNaturalHeight;
+            if (!svgWidth || !svgHeight) return;
             
             // Get viewport dimensions
             const viewportWidth = container.clientWidth;
             const viewportHeight = container.clientHeight;
             
-            // Get SVG's natural dimensions
-            const viewBox = svg.viewBox.baseVal;
-            const svgWidth = viewBox.width || svg.width.baseVal.value;
-            const svgHeight = viewBox.height || svg.height.baseVal.value;
-            
             // Account for the margin (20px on each side = 40px total)
             const margin = 20;
             const totalMargin = margin * 2;
@@ -275,7 +396,7 @@ const GraphvizViewerComponent = {
             const newZoom = Math.min(zoomX, zoomY);
             
             // Clamp to zoom limits
-            this.zoomFactor = Math.max(0.35, Math.min(2.0, newZoom));
+            this.zoomFactor = Math.max(MIN_ZOOM, Math.min(MAX_ZOOM, newZoom));
             
             // Wait for Vue to update the size, then center
             this.$nextTick(() => {
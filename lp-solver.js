@@ -3,6 +3,13 @@
  * 
  * This module provides an abstraction for solving LP problems from text format.
  * Uses the HiGHS solver via highs-js.
+ * 
+ * The bundled highs.wasm build has one matrix entry point, Highs_call, which
+ * takes a column-wise sparse LP (costs, bounds, a_start/a_index/a_value) but no
+ * integrality vector. The models built by optimize.js declare integer
+ * variables, so they must go through Highs_readModel as CPLEX LP text instead.
+ * The text never touches disk: highs-js writes it to Emscripten's in-memory
+ * file system and reads it back from there.
  */
 
 /**
@@ -34,46 +34,67 @@ const _LOGGER = {
 // Variable type constant for LP generation
 const INTEGER = "INTEGER";
 
+// Coefficients with smaller magnitude are treated as zero and not emitted
+const _NEAR_ZERO = 1e-10;
+
+// Characters not allowed in MIP solver names and their replacements
+const _UNSAFE_VAR_NAME_CHARS = /[:() -]/g;
+const _SAFE_VAR_NAME_REPLACEMENTS = {":": "", "(": "", ")": "", "-": "_", " ": "_"};
+
+// name -> safe name table shared by all builders; names come from recipe and
+// part data, so the table stays bounded by the recipe database
+const _SAFE_VAR_NAMES = new Map();
+
 // ============================================================================
 // Classes
 // ============================================================================
 
-/**
- * Variable metadata for LP model.
- */
-class Variable {
-    /**
-     * @param {string} name - variable name
-     * @param {string} var_type - INTEGER or CONTINUOUS
-     * @param {number} lb - lower bound (default 0)
-     */
-    constructor(name, var_type, lb = 0) {
-        this.name = name;
-        this.var_type = var_type;
-        this.lb = lb;
-    }
-}
-
 /**
  * Linear expression holding variable-coefficient pairs and a constant.
+ *
+ * Variables are the integer ids handed out by LPBuilder.add_var. Terms are
+ * kept consolidated in a Map keyed by variable id, so duplicate variables
+ * are merged as expressions are combined rather than at emission.
  */
 class LinExpr {
     /**
-     * @param {Array<[Variable, number]>} terms - list of [Variable, coefficient] pairs
+     * @param {Array<[number, number]>|Map<number, number>|null} terms - [variable id, coefficient] pairs or consolidated map
      * @param {number} constant - constant offset in the expression
      */
     constructor(terms = null, constant = 0) {
-        this.terms = terms !== null ? terms : [];
+        if (terms instanceof Map) {
+            this.terms = terms;
+        } else {
+            this.terms = new Map();
+            if (terms !== null) {
+                for (const [var_id, coef] of terms) {
+                    this.terms.set(var_id, (this.terms.get(var_id) || 0) + coef);
+                }
+            }
+        }
         this.constant = constant;
     }
     
+    /**
+     * Create expression for a single variable.
+     * @param {number} var_id - variable id from LPBuilder.add_var
+     * @param {number} coef - coefficient of the variable (default 1)
+     * @returns {LinExpr} new linear expression
+     */
+    static from_var(var_id, coef = 1.0) {
+        return new LinExpr(new Map([[var_id, coef]]), 0);
+    }
+    
     /**
      * Multiply all terms and constant by scalar.
      * @param {number} scalar - scalar to multiply by
      * @returns {LinExpr} new linear expression
      */
     mul(scalar) {
-        const new_terms = this.terms.map(([var_obj, coef]) => [var_obj, coef * scalar]);
+        const new_terms = new Map();
+        for (const [var_id, coef] of this.terms) {
+            new_terms.set(var_id, coef * scalar);
+        }
         return new LinExpr(new_terms, this.constant * scalar);
     }
     
@@ -83,9 +104,12 @@ class LinExpr {
      * @returns {LinExpr} new linear expression
      */
     add(other) {
-        const new_terms = this.terms.concat(other.terms);
-        const new_constant = this.constant + other.constant;
-        return new LinExpr(new_terms, new_constant);
+        const new_terms = new Map(this.terms);
+        for (const [var_id, coef] of other.terms) {
+            const existing_coef = new_terms.get(var_id);
+            new_terms.set(var_id, existing_coef === undefined ? coef : existing_coef + coef);
+        }
+        return new LinExpr(new_terms, this.constant + other.constant);
     }
     
     /**
@@ -94,7 +118,37 @@ class LinExpr {
      * @returns {LinExpr} new linear expression
      */
     sub(other) {
-        return this.add(other.mul(-1));
+        // merge negated terms directly rather than building other.mul(-1) first
+        const new_terms = new Map(this.terms);
+        for (const [var_id, coef] of other.terms) {
+            const existing_coef = new_terms.get(var_id);
+            new_terms.set(var_id, existing_coef === undefined ? -coef : existing_coef - coef);
+        }
+        return new LinExpr(new_terms, this.constant - other.constant);
+    }
+    
+    /**
+     * Drop terms whose coefficients are near zero.
+     * @returns {LinExpr} this expression if no term is near zero, otherwise a new pruned expression
+     */
+    without_near_zero_terms() {
+        let has_near_zero = false;
+        for (const coef of this.terms.values()) {
+            if (Math.abs(coef) <= _NEAR_ZERO) {
+                has_near_zero = true;
+                break;
+            }
+        }
+        if (!has_near_zero) {
+            return this;
+        }
+        const new_terms = new Map();
+        for (const [var_id, coef] of this.terms) {
+            if (Math.abs(coef) > _NEAR_ZERO) {
+                new_terms.set(var_id, coef);
+            }
+        }
+        return new LinExpr(new_terms, this.constant);
     }
     
     /**
@@ -129,33 +183,46 @@ class Constraint {
  */
 class LPBuilder {
     constructor() {
-        this.variables = [];
+        // variable attributes indexed by variable id
+        this.var_names = [];
+        this.var_types = [];
+        this.var_lbs = [];
+        // " name" suffix appended after the coefficient when emitting a term
+        this.var_emit_suffixes = [];
         this.constraints = [];
         this.constraint_names = [];
         this.objective = null;
+        // formatted "  +coef" prefixes, reset on every to_lp_text() call
+        this._coefficient_strings = new Map();
     }
     
     /**
-     * Create new variable and return LinExpr representing it.
-     * @param {string} name - variable name
+     * Create new variable and return its id.
+     * @param {string} name - variable name (converted to a safe MIP solver name)
      * @param {string} var_type - INTEGER or CONTINUOUS
      * @param {number} lb - lower bound (default 0)
-     * @returns {LinExpr} linear expression representing the variable
+     * @returns {number} id of the new variable, usable as a LinExpr term key
      */
     add_var(name, var_type, lb = 0) {
-        const var_obj = new Variable(name, var_type, lb);
-        this.variables.push(var_obj);
-        return new LinExpr([[var_obj, 1.0]], 0);
+        const var_id = this.var_names.length;
+        const safe_name = _safe_var_name(name);
+        this.var_names.push(safe_name);
+        this.var_types.push(var_type);
+        this.var_lbs.push(lb);
+        this.var_emit_suffixes.push(` ${safe_name}`);
+        return var_id;
     }
     
     /**
      * Add constraint with given name.
      * @param {Constraint} constraint - constraint to add
-     * @param {string} name - constraint name
+     * @param {string} name - constraint name (converted to a safe MIP solver name)
      */
     add_constraint(constraint, name) {
-        this.constraints.push(constraint);
-        this.constraint_names.push(name);
+        // prune near-zero terms up front so emission can write every term
+        const expr = constraint.expr.without_near_zero_terms();
+        this.constraints.push(expr === constraint.expr ? constraint : new Constraint(expr, constraint.rhs));
+        this.constraint_names.push(_safe_var_name(name));
     }
     
     /**
@@ -163,76 +230,63 @@ class LPBuilder {
      * @param {LinExpr} expr - objective expression
      */
     set_objective(expr) {
-        this.objective = expr;
+        this.objective = expr.without_near_zero_terms();
     }
     
     /**
-     * Consolidate duplicate variables by summing their coefficients.
-     * @param {Array<[Variable, number]>} terms - list of [Variable, coefficient] pairs
-     * @returns {Object<string, [Variable, number]>} dict mapping var name -> [Variable, coefficient]
+     * Format a coefficient as a signed term prefix, reusing earlier results.
+     * @param {number} coef - coefficient to format
+     * @returns {string} "  +coef" for non-negative values, "  coef" otherwise
      */
-    _consolidate_terms(terms) {
-        const consolidated = {};
-        for (const [var_obj, coef] of terms) {
-            if (var_obj.name in consolidated) {
-                const [_, existing_coef] = consolidated[var_obj.name];
-                consolidated[var_obj.name] = [var_obj, existing_coef + coef];
-            } else {
-                consolidated[var_obj.name] = [var_obj, coef];
-            }
+    _format_coefficient(coef) {
+        let text = this._coefficient_strings.get(coef);
+        if (text === undefined) {
+            text = coef >= 0 ? `  +${coef}` : `  ${coef}`;
+            this._coefficient_strings.set(coef, text);
         }
-        return consolidated;
+        return text;
     }
     
     /**
      * Format expression terms into lines respecting line length limit.
      * @param {string} label - label for the expression
-     * @param {Object<string, [Variable, number]>} terms_dict - consolidated terms
+     * @param {Map<number, number>} terms_dict - consolidated variable id -> coefficient terms
      * @param {number} constant - constant value (default 0)
      * @param {number} max_line_len - maximum line length (default 500)
      * @returns {Array<string>} array of formatted lines
      */
     _format_expression_line(label, terms_dict, constant = 0, max_line_len = 500) {
         const lines = [];
-        let current_line = label;
+        // fragments of the line being built, joined once when the line is flushed
+        let line_parts = [label];
+        let line_len = label.length;
+        let is_bare_label = true;
         
-        for (const [var_obj, coef] of Object.values(terms_dict)) {
-            if (Math.abs(coef) > 1e-10) {  // skip near-zero coefficients
-                let term;
-                if (coef >= 0) {
-                    term = `  +${coef} ${var_obj.name}`;
-                } else {
-                    term = `  ${coef} ${var_obj.name}`;
-                }
-                
-                // check if adding this term would exceed line length
-                if (current_line.length + term.length > max_line_len && current_line !== label) {
-                    lines.push(current_line);
-                    current_line = " " + term;  // continuation lines start with space
-                } else {
-                    current_line += term;
-                }
+        const append_term = (term) => {
+            // check if adding this term would exceed line length
+            if (line_len + term.length > max_line_len && !is_bare_label) {
+                lines.push(line_parts.join(""));
+                line_parts = [" ", term];  // continuation lines start with space
+                line_len = 1 + term.length;
+            } else {
+                line_parts.push(term);
+                line_len += term.length;
             }
+            is_bare_label = false;
+        };
+        
+        // near-zero coefficients were already pruned by add_constraint/set_objective
+        for (const [var_id, coef] of terms_dict) {
+            append_term(this._format_coefficient(coef) + this.var_emit_suffixes[var_id]);
         }
         
         // add constant if non-zero
-        if (Math.abs(constant) > 1e-10) {
-            let term;
-            if (constant >= 0) {
-                term = `  +${constant}`;
-            } else {
-                term = `  ${constant}`;
-            }
-            if (current_line.length + term.length > max_line_len && current_line !== label) {
-                lines.push(current_line);
-                current_line = " " + term;
-            } else {
-                current_line += term;
-            }
+        if (Math.abs(constant) > _NEAR_ZERO) {
+            append_term(this._format_coefficient(constant));
         }
         
-        if (current_line) {
-            lines.push(current_line);
+        if (line_len > 0) {
+            lines.push(line_parts.join(""));
         }
         
         return lines;
@@ -243,29 +297,28 @@ class LPBuilder {
      * @returns {string} LP format text
      */
     to_lp_text() {
+        this._coefficient_strings.clear();
         const lines = [];
         lines.push("\\Problem name: ");
         lines.push("");
         lines.push("Minimize");
         
-        // Objective function - consolidate and handle line breaks
+        // Objective function - terms are already consolidated, handle line breaks
         if (this.objective) {
-            const consolidated = this._consolidate_terms(this.objective.terms);
-            const obj_lines = this._format_expression_line("OBJROW:", consolidated, this.objective.constant);
+            const obj_lines = this._format_expression_line("OBJROW:", this.objective.terms, this.objective.constant);
             lines.push(...obj_lines);
         } else {
             lines.push("OBJROW:");
         }
         
-        // Constraints - consolidate and handle line breaks
+        // Constraints - terms are already consolidated, handle line breaks
         lines.push("Subject To");
         for (let i = 0; i < this.constraints.length; i++) {
             const constraint = this.constraints[i];
             const name = this.constraint_names[i];
-            const consolidated = this._consolidate_terms(constraint.expr.terms);
             // move constant to RHS
             const rhs = constraint.rhs - constraint.expr.constant;
-            const constr_lines = this._format_expression_line(`${name}:`, consolidated);
+            const constr_lines = this._format_expression_line(`${name}:`, constraint.expr.terms);
             // add >= rhs to the last line
             if (constr_lines.length > 0) {
                 constr_lines[constr_lines.length - 1] += ` >= ${rhs}`;
@@ -277,32 +330,31 @@ class LPBuilder {
         
         // Bounds (only if non-default)
         lines.push("Bounds");
-        for (const var_obj of this.variables) {
-            if (var_obj.lb !== 0) {
-                lines.push(`${var_obj.lb} <= ${var_obj.name}`);
+        for (let var_id = 0; var_id < this.var_names.length; var_id++) {
+            if (this.var_lbs[var_id] !== 0) {
+                lines.push(`${this.var_lbs[var_id]} <= ${this.var_names[var_id]}`);
             }
         }
         
         // Integer variables - handle line breaks for long lists
         lines.push("Integers");
-        const int_vars = this.variables
-            .filter(v => v.var_type === INTEGER)
-            .map(v => v.name);
-        if (int_vars.length > 0) {
-            // break into multiple lines if too long
-            let current_line = "";
-            for (const var_name of int_vars) {
-                if (current_line.length + var_name.length + 1 > 500) {
-                    lines.push(current_line + " ");
-                    current_line = var_name;
-                } else {
-                    current_line += (current_line ? " " : "") + var_name;
-                }
-            }
-            if (current_line) {
-                lines.push(current_line + " ");
+        const int_vars = this.var_names.filter((_, var_id) => this.var_types[var_id] === INTEGER);
+        // break into multiple lines if too long, joining each line's names once
+        let line_names = [];
+        let line_len = 0;
+        for (const var_name of int_vars) {
+            if (line_names.length > 0 && line_len + var_name.length + 1 > 500) {
+                lines.push(line_names.join(" ") + " ");
+                line_names = [var_name];
+                line_len = var_name.length;
+            } else {
+                line_len += line_names.length > 0 ? var_name.length + 1 : var_name.length;
+                line_names.push(var_name);
             }
         }
+        if (line_names.length > 0) {
+            lines.push(line_names.join(" ") + " ");
+        }
         
         lines.push("End");
         return lines.join("\n");
@@ -328,12 +380,38 @@ class LPBuilder {
  * @returns {string} string safe for use as MIP solver variable name
  */
 function _safe_var_name(name) {
-    return name
-        .replace(/:/g, "")
-        .replace(/\(/g, "")
-        .replace(/\)/g, "")
-        .replace(/-/g, "_")
-        .replace(/ /g, "_");
+    let safe_name = _SAFE_VAR_NAMES.get(name);
+    if (safe_name === undefined) {
+        safe_name = name.replace(_UNSAFE_VAR_NAME_CHARS, (ch) => _SAFE_VAR_NAME_REPLACEMENTS[ch]);
+        _SAFE_VAR_NAMES.set(name, safe_name);
+    }
+    return safe_name;
+}
+
+/**
+ * Sum linear expressions into a single expression.
+ *
+ * Precondition:
+ *     exprs is an iterable of LinExpr
+ *
+ * Postcondition:
+ *     returns a new LinExpr whose coefficients and constant are the sums over exprs
+ *     the inputs are not modified
+ *
+ * @param {Iterable<LinExpr>} exprs - expressions to sum
+ * @returns {LinExpr} sum of all expressions
+ */
+function _sum_linexprs(exprs) {
+    const terms = new Map();
+    let constant = 0;
+    for (const expr of exprs) {
+        for (const [var_id, coef] of expr.terms) {
+            const existing_coef = terms.get(var_id);
+            terms.set(var_id, existing_coef === undefined ? coef : existing_coef + coef);
+        }
+        constant += expr.constant;
+    }
+    return new LinExpr(terms, constant);
 }
 
 // ============================================================================
@@ -380,41 +458,66 @@ function _validate_and_set_defaults(enablement_set, economy, outputs, design_pow
 // LP Building Functions
 // ============================================================================
 
+/**
+ * List the enabled recipes together with their machine.
+ *
+ * Precondition:
+ *     enablement_set is either null or a Set of recipe names
+ *
+ * Postcondition:
+ *     returns array of [machine_name, recipe_name, recipe] in machine order
+ *     only recipes in enablement_set are included (all recipes if null)
+ *
+ * @param {Set<string>|null} enablement_set - set of enabled recipe names
+ * @returns {Array<[string, string, Recipe]>} array of [machine_name, recipe_name, recipe]
+ */
+function _collect_enabled_recipes(enablement_set) {
+    const enabled_recipes = [];
+    for (const [machine_name, machine_recipes] of Object.entries(get_all_recipes_by_machine())) {
+        for (const [recipe_name, recipe] of Object.entries(machine_recipes)) {
+            if (enablement_set === null || enablement_set.has(recipe_name)) {
+                enabled_recipes.push([machine_name, recipe_name, recipe]);
+            }
+        }
+    }
+    return enabled_recipes;
+}
+
 /**
  * Build a matrix of how recipes produce/consume materials.
  *
  * Precondition:
- *     enablement_set is a Set of valid recipe names
+ *     enabled_recipes is an array of [machine_name, recipe_name, recipe]
  *
  * Postcondition:
  *     returns nested object where part_recipe_matrix[part][recipe] = amount
+ *     amount is the net of a recipe's outputs minus its inputs for that part
  *     negative amounts represent consumption (inputs)
  *     positive amounts represent production (outputs)
  *
- * @param {Set<string>} enablement_set - set of enabled recipe names
+ * @param {Array<[string, string, Recipe]>} enabled_recipes - enabled recipes from _collect_enabled_recipes
  * @returns {Object<string, Object<string, number>>} nested object mapping material -> recipe -> amount (neg=input, pos=output)
  */
-function _build_part_recipe_matrix(enablement_set) {
+function _build_part_recipe_matrix(enabled_recipes) {
     const part_recipe_matrix = {};
 
-    const recipes_by_machine = get_all_recipes_by_machine();
-    for (const [_machine_name, machine_recipes] of Object.entries(recipes_by_machine)) {
-        for (const [recipe_name, recipe] of Object.entries(machine_recipes)) {
-            if (enablement_set !== null && !enablement_set.has(recipe_name)) {
-                continue;
+    for (const [_machine_name, recipe_name, recipe] of enabled_recipes) {
+        for (const [part, amount] of Object.entries(recipe.inputs)) {
+            let recipe_amounts = part_recipe_matrix[part];
+            if (recipe_amounts === undefined) {
+                recipe_amounts = part_recipe_matrix[part] = {};
             }
-            for (const [part, amount] of Object.entries(recipe.inputs)) {
-                if (!(part in part_recipe_matrix)) {
-                    part_recipe_matrix[part] = {};
-                }
-                part_recipe_matrix[part][recipe_name] = -amount;
-            }
-            for (const [part, amount] of Object.entries(recipe.outputs)) {
-                if (!(part in part_recipe_matrix)) {
-                    part_recipe_matrix[part] = {};
-                }
-                part_recipe_matrix[part][recipe_name] = amount;
+            recipe_amounts[recipe_name] = -amount;
+        }
+        for (const [part, amount] of Object.entries(recipe.outputs)) {
+            let recipe_amounts = part_recipe_matrix[part];
+            if (recipe_amounts === undefined) {
+                recipe_amounts = part_recipe_matrix[part] = {};
             }
+            // a part that is both consumed and produced by this recipe
+            // (e.g. Water in "Alternate: Instant Scrap") contributes the net amount
+            const input_amount = recipe.inputs[part];
+            recipe_amounts[recipe_name] = input_amount === undefined ? amount : amount - input_amount;
         }
     }
 
@@ -485,28 +588,22 @@ function _validate_optimization_succeeded(result, design_power, lp_text = null)
  *
  * Precondition:
  *     builder is an LPBuilder instance
- *     enablement_set is a Set of enabled recipe names
+ *     enabled_recipes is an array of [machine_name, recipe_name, recipe]
  *
  * Postcondition:
- *     returns object mapping recipe_name -> LinExpr
+ *     returns object mapping recipe_name -> variable id
  *     variables are INTEGER type with lower bound 0
  *     variables are added to the builder
  *
  * @param {LPBuilder} builder - LP builder to add variables to
- * @param {Set<string>} enablement_set - set of enabled recipe names
- * @returns {Object<string, LinExpr>} object mapping recipe name -> LinExpr
+ * @param {Array<[string, string, Recipe]>} enabled_recipes - enabled recipes from _collect_enabled_recipes
+ * @returns {Object<string, number>} object mapping recipe name -> variable id
  */
-function _create_recipe_variables(builder, enablement_set) {
+function _create_recipe_variables(builder, enabled_recipes) {
     const recipe_vars = {};
-    const recipes_by_machine = get_all_recipes_by_machine();
     
-    for (const [machine_name, machine_recipes] of Object.entries(recipes_by_machine)) {
-        for (const recipe_name of Object.keys(machine_recipes)) {
-            if (enablement_set === null || enablement_set.has(recipe_name)) {
-                const var_name = _safe_var_name(`${machine_name}_${recipe_name}`);
-                recipe_vars[recipe_name] = builder.add_var(var_name, INTEGER, 0);
-            }
-        }
+    for (const [machine_name, recipe_name, _recipe] of enabled_recipes) {
+        recipe_vars[recipe_name] = builder.add_var(`${machine_name}_${recipe_name}`, INTEGER, 0);
     }
     
     return recipe_vars;
@@ -516,32 +613,25 @@ function _create_recipe_variables(builder, enablement_set) {
  * Extract recipe counts from solver result.
  *
  * Precondition:
- *     recipe_vars contains LinExpr for each recipe
+ *     builder is the LPBuilder the recipe variables were added to
+ *     recipe_vars contains a variable id for each recipe
  *     result contains solved variable values
  *
  * Postcondition:
  *     returns object containing only recipes with positive counts
  *     counts are extracted from result variable values by name
  *
- * @param {Object<string, LinExpr>} recipe_vars - object mapping recipe name -> LinExpr
+ * @param {LPBuilder} builder - LP builder holding the variable names
+ * @param {Object<string, number>} recipe_vars - object mapping recipe name -> variable id
  * @param {SolverResult} result - SolverResult with variable values
  * @returns {Object<string, number>} object mapping recipe name -> machine count (positive values only)
  */
-function _extract_recipe_counts(recipe_vars, result) {
+function _extract_recipe_counts(builder, recipe_vars, result) {
     const output = {};
     
-    for (const [recipe_name, linexpr] of Object.entries(recipe_vars)) {
-        // LinExpr should have exactly one term for recipe variables
-        if (linexpr.terms.length !== 1) {
-            throw new Error(`Recipe variable should have exactly one term: ${recipe_name}`);
-        }
-        const [var_obj, coef] = linexpr.terms[0];
-        if (coef !== 1.0) {
-            throw new Error(`Recipe variable should have coefficient 1: ${recipe_name}`);
-        }
-        
+    for (const [recipe_name, var_id] of Object.entries(recipe_vars)) {
         // look up variable value in result
-        const value = result.variable_values[var_obj.name] || 0;
+        const value = result.variable_values[builder.var_names[var_id]] || 0;
         if (value > 0) {
             output[recipe_name] = Math.round(value);
         }
@@ -556,7 +646,7 @@ function _extract_recipe_counts(recipe_vars, result) {
  * Precondition:
  *     part is a material name
  *     contributors_dict maps recipe names to amounts (neg=input, pos=output)
- *     recipe_vars maps recipe names to LinExpr
+ *     recipe_vars maps recipe names to variable ids
  *     inputs maps material names to available input amounts
  *     design_power indicates whether power production is enabled
  *
@@ -566,39 +656,31 @@ function _extract_recipe_counts(recipe_vars, result) {
  *
  * @param {string} part - material name
  * @param {Object<string, number>} contributors_dict - recipe contributions for this part
- * @param {Object<string, LinExpr>} recipe_vars - LinExpr for recipes
+ * @param {Object<string, number>} recipe_vars - variable ids for recipes
  * @param {Object<string, number>} inputs - available input materials
  * @param {boolean} design_power - whether power design is enabled
  * @returns {LinExpr} LinExpr for total part count
  */
 function _compute_part_count(part, contributors_dict, recipe_vars, inputs, design_power) {
-    const part_recipe_contributions = [];
+    // write each recipe's coefficient straight into one term map
+    const terms = new Map();
     
     for (const [recipe_name, amount] of Object.entries(contributors_dict)) {
         // no power production when power design is disabled
         if (part === "MWm" && !design_power && amount > 0) {
             continue;
         }
-        part_recipe_contributions.push(recipe_vars[recipe_name].mul(amount));
+        const var_id = recipe_vars[recipe_name];
+        const existing_coef = terms.get(var_id);
+        terms.set(var_id, existing_coef === undefined ? amount : existing_coef + amount);
     }
     
-    if (part_recipe_contributions.length === 0) {
+    if (terms.size === 0) {
         throw new Error("It should not be in the matrix if it has no contributors.");
     }
     
-    // chain .add() to sum all contributions
-    let result = part_recipe_contributions[0];
-    for (let i = 1; i < part_recipe_contributions.length; i++) {
-        result = result.add(part_recipe_contributions[i]);
-    }
-    
-    // add input constant if present
-    const input_amount = inputs[part] || 0;
-    if (input_amount !== 0) {
-        result = result.add(new LinExpr([], input_amount));
-    }
-    
-    return result;
+    // input amount (if any) is the constant term
+    return new LinExpr(terms, inputs[part] || 0);
 }
 
 /**
@@ -632,86 +714,13 @@ function _apply_economy_weight(weighted_cost, part, economy) {
     return weighted_cost;
 }
 
-/**
- * Compute weighted cost for a non-output part and update power tracking.
- *
- * Precondition:
- *     part is a material name not in outputs
- *     part_count is a LinExpr for part availability
- *     base_parts is the set of base materials
- *     inputs maps material names to available input amounts
- *     design_power indicates whether power design is enabled
- *     weights are non-negative numbers
- *     economy is either null or an object of material values
- *     builder is the LPBuilder
- *     power_sum is current power tracking expression or null
- *
- * Postcondition:
- *     returns [weighted_part_cost, updated_power_sum]
- *     weighted_part_cost may be null if weight is zero
- *     adds balance constraint to builder for non-base, non-power parts
- *     parts with input quantity of 0 are allowed negative balances (can be external inputs)
- *     updates power_sum if part is "MWm" and design_power is true
- *
- * @param {string} part - material name
- * @param {LinExpr} part_count - LinExpr for part availability
- * @param {Set<string>} base_parts - set of base material names
- * @param {Object<string, number>} inputs - material -> available amount
- * @param {boolean} design_power - whether power design is enabled
- * @param {number} input_costs_weight - weight for input costs
- * @param {number} power_consumption_weight - weight for power consumption
- * @param {Object<string, number>|null} economy - optional economy object
- * @param {LPBuilder} builder - LP builder
- * @param {LinExpr|null} power_sum - current power sum tracking or null
- * @returns {[LinExpr|null, LinExpr|null]} tuple of (weighted_part_cost or null, updated_power_sum or null)
- */
-function _compute_weighted_part_cost(
-    part,
-    part_count,
-    base_parts,
-    inputs,
-    design_power,
-    input_costs_weight,
-    power_consumption_weight,
-    economy,
-    builder,
-    power_sum
-) {
-    let weighted_part_cost = part_count.mul(-1);
-    weighted_part_cost = _apply_economy_weight(weighted_part_cost, part, economy);
-
-    if (part === "MWm") {
-        if (design_power) {
-            power_sum = power_sum !== null ? power_sum.add(part_count) : part_count;
-        }
-        if (power_consumption_weight > 0) {
-            weighted_part_cost = weighted_part_cost.mul(power_consumption_weight);
-        } else {
-            weighted_part_cost = null;
-        }
-    } else if (base_parts.has(part) || (part in inputs && inputs[part] === 0)) {
-        // allow base parts and parts with input quantity 0 to have negative balances
-        if (input_costs_weight > 0) {
-            weighted_part_cost = weighted_part_cost.mul(input_costs_weight);
-        } else {
-            weighted_part_cost = null;
-        }
-    } else {
-        // force non-base parts and parts with input quantity > 0 to have non-negative balances
-        const constraint = part_count.greater_or_equal(0);
-        builder.add_constraint(constraint, _safe_var_name(`${part}_balance`));
-    }
-
-    return [weighted_part_cost, power_sum];
-}
-
 /**
  * Add material balance constraints to LP builder for all parts.
  *
  * Precondition:
  *     builder is an LPBuilder with recipe variables added
  *     part_recipe_matrix maps materials to recipe contributions
- *     recipe_vars maps recipe names to LinExpr
+ *     recipe_vars maps recipe names to variable ids
  *     inputs maps material names to available amounts
  *     outputs maps material names to required amounts
  *     economy is either null or an object of material values
@@ -722,12 +731,14 @@ function _compute_weighted_part_cost(
  * Postcondition:
  *     material balance constraints are added to builder
  *     output constraints ensure outputs meet requirements
+ *     non-base parts with input quantity > 0 get non-negative balance constraints
+ *     base parts and parts with input quantity of 0 may have negative balances (external inputs)
  *     cost constraints track input costs
  *     returns [list of cost LinExpr, power_sum expression or null]
  *
  * @param {LPBuilder} builder - LP builder
  * @param {Object<string, Object<string, number>>} part_recipe_matrix - material -> recipe -> amount
- * @param {Object<string, LinExpr>} recipe_vars - recipe -> LinExpr
+ * @param {Object<string, number>} recipe_vars - recipe -> variable id
  * @param {Object<string, number>} inputs - material -> available amount
  * @param {Object<string, number>} outputs - material -> required amount
  * @param {Object<string, number>|null} economy - optional economy object
@@ -753,50 +764,60 @@ function _add_material_balance_constraints(
     const part_costs = [];
     const wastes = [];
 
+    // membership tables used for every part, built once per call
+    const output_parts = new Set(Object.keys(outputs));
+    // base parts and parts with input quantity 0 may have negative balances
+    const unbalanced_parts = new Set(base_parts);
+    for (const [part, amount] of Object.entries(inputs)) {
+        if (amount === 0) {
+            unbalanced_parts.add(part);
+        }
+    }
+
     for (const [part, contributors_dict] of Object.entries(part_recipe_matrix)) {
         const part_count = _compute_part_count(part, contributors_dict, recipe_vars, inputs, design_power);
 
-        if (part in outputs) {
+        if (output_parts.has(part)) {
             // add output constraint: part_count >= outputs[part]
-            const constraint = part_count.sub(new LinExpr([], outputs[part])).greater_or_equal(0);
-            builder.add_constraint(constraint, _safe_var_name(`${part}_output`));
+            const constraint = part_count.greater_or_equal(outputs[part]);
+            builder.add_constraint(constraint, `${part}_output`);
             if (part === "MWm") {
                 power_sum = power_sum === null ? part_count : part_count;
             }
         } else {
             // handle cost for non-output parts
-            const part_cost = builder.add_var(
-                _safe_var_name(`${part}_cost`), INTEGER
-            );
+            const part_cost = LinExpr.from_var(builder.add_var(`${part}_cost`, INTEGER));
 
-            const waste = builder.add_var(
-                _safe_var_name(`${part}_waste`), INTEGER
-            );
+            const waste = LinExpr.from_var(builder.add_var(`${part}_waste`, INTEGER));
 
-            const [weighted_part_cost, updated_power_sum] = _compute_weighted_part_cost(
-                part,
-                part_count,
-                base_parts,
-                inputs,
-                design_power,
-                input_costs_weight,
-                power_consumption_weight,
-                economy,
-                builder,
-                power_sum
-            );
-            
-            power_sum = updated_power_sum;
+            // weighted_part_cost is null when the part's cost weight is zero
+            let weighted_part_cost = _apply_economy_weight(part_count.mul(-1), part, economy);
+            if (part === "MWm") {
+                if (design_power) {
+                    power_sum = power_sum !== null ? power_sum.add(part_count) : part_count;
+                }
+                weighted_part_cost = power_consumption_weight > 0
+                    ? weighted_part_cost.mul(power_consumption_weight)
+                    : null;
+            } else if (unbalanced_parts.has(part)) {
+                // allow base parts and parts with input quantity 0 to have negative balances
+                weighted_part_cost = input_costs_weight > 0
+                    ? weighted_part_cost.mul(input_costs_weight)
+                    : null;
+            } else {
+                // force non-base parts and parts with input quantity > 0 to have non-negative balances
+                builder.add_constraint(part_count.greater_or_equal(0), `${part}_balance`);
+            }
 
             if (weighted_part_cost !== null) {
                 // part_cost >= weighted_part_cost  =>  part_cost - weighted_part_cost >= 0
                 const constraint = part_cost.sub(weighted_part_cost).greater_or_equal(0);
-                builder.add_constraint(constraint, _safe_var_name(`${part}_cost`));
+                builder.add_constraint(constraint, `${part}_cost`);
                 part_costs.push(part_cost);
             }
 
             const constraint = waste.sub(part_count).greater_or_equal(0);
-            builder.add_constraint(constraint, _safe_var_name(`${part}_waste`));
+            builder.add_constraint(constraint, `${part}_waste`);
             wastes.push(waste);
         }
     }
@@ -810,7 +831,7 @@ function _add_material_balance_constraints(
  * Precondition:
  *     builder has all constraints added
  *     part_costs is a list of LinExpr cost variables
- *     recipe_vars maps recipe names to LinExpr
+ *     recipe_vars maps recipe names to variable ids
  *     weights are non-negative numbers
  *
  * Postcondition:
@@ -818,7 +839,7 @@ function _add_material_balance_constraints(
  *
  * @param {LPBuilder} builder - LP builder with constraints
  * @param {Array<LinExpr>} part_costs - list of cost LinExpr
- * @param {Object<string, LinExpr>} recipe_vars - recipe -> LinExpr
+ * @param {Object<string, number>} recipe_vars - recipe -> variable id
  * @param {number} input_costs_weight - weight for input costs
  * @param {number} machine_counts_weight - weight for machine counts
  */
@@ -831,26 +852,12 @@ function _set_objective(
     machine_counts_weight,
     waste_products_weight
 ) {
-    // sum all part costs
-    let objective = new LinExpr([], 0);
-    for (const cost of part_costs) {
-        objective = objective.add(cost);
-    }
-    objective = objective.mul(input_costs_weight);
-    
-    // add machine counts
-    let machine_sum = new LinExpr([], 0);
-    for (const recipe_expr of Object.values(recipe_vars)) {
-        machine_sum = machine_sum.add(recipe_expr);
-    }
-    objective = objective.add(machine_sum.mul(machine_counts_weight));
-    
-    // add wastes
-    let waste_sum = new LinExpr([], 0);
-    for (const waste of wastes) {
-        waste_sum = waste_sum.add(waste);
-    }
-    objective = objective.add(waste_sum.mul(waste_products_weight));
+    const objective = _sum_linexprs([
+        _sum_linexprs(part_costs).mul(input_costs_weight),
+        // recipe variable ids are distinct, so the map needs no consolidation
+        new LinExpr(new Map(Object.values(recipe_vars).map((var_id) => [var_id, machine_counts_weight]))),
+        _sum_linexprs(wastes).mul(waste_products_weight)
+    ]);
 
     builder.set_objective(objective);
 }
@@ -920,12 +927,13 @@ async function optimize_recipes(
     );
 
     report_progress("Building recipe matrix...");
-    const part_recipe_matrix = _build_part_recipe_matrix(enablement_set);
+    const enabled_recipes = _collect_enabled_recipes(enablement_set);
+    const part_recipe_matrix = _build_part_recipe_matrix(enabled_recipes);
     _validate_outputs_are_producible(outputs, part_recipe_matrix);
 
     report_progress("Creating LP model...");
     const builder = new LPBuilder();
-    const recipe_vars = _create_recipe_variables(builder, enablement_set);
+    const recipe_vars = _create_recipe_variables(builder, enabled_recipes);
 
     report_progress("Adding constraints...");
     const [part_costs, power_sum, wastes] = _add_material_balance_constraints(
@@ -961,7 +969,7 @@ async function optimize_recipes(
 
     report_progress("Extracting solution...");
     _validate_optimization_succeeded(result, design_power, lp_text);
-    return _extract_recipe_counts(recipe_vars, result);
+    return _extract_recipe_counts(builder, recipe_vars, result);
 }
 
 // ============================================================================
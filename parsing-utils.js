@@ -2,66 +2,48 @@
  * Utility functions for parsing material and rate specifications.
  */
 
-/**
- * Validate that text contains a colon separator.
- * 
- * Precondition:
- *     text is a non-null string
- * 
- * Postcondition:
- *     throws Error if ':' not in text, otherwise returns undefined
- * 
- * @param {string} text - string to validate
- * @throws {Error} if text does not contain a colon
- */
-function _validate_has_colon(text) {
-    if (!text.includes(':')) {
-        throw new Error(`Invalid format: '${text}'. Expected 'Material:Rate'`);
-    }
-}
+// leading decimal number (optional sign, fraction and exponent) or Infinity
+// after optional whitespace, i.e. the prefix parseFloat would consume; trailing
+// text such as '120/min' is ignored as it always has been. One match validates
+// the rate and captures the number, so malformed rates are rejected without
+// relying on NaN.
+const _RATE_PATTERN = /^\s*([+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))/;
 
-/**
- * Split text on colon and trim whitespace from both parts.
- * 
- * Precondition:
- *     text contains at least one colon character
- * 
- * Postcondition:
- *     returns [material_name, rate_string] where both are stripped of whitespace
- * 
- * @param {string} text - string in format "Material:Rate"
- * @returns {[string, string]} [material_name, rate_string] with whitespace removed
- */
-function _split_material_rate_string(text) {
-    const colonIndex = text.indexOf(':');
-    const material = text.substring(0, colonIndex);
-    const rate_str = text.substring(colonIndex + 1);
-    return [material.trim(), rate_str.trim()];
-}
+// memo of previously parsed strings; config text is re-parsed on every
+// generation, so the same lines come back repeatedly
+const _PARSED_RATES = new Map();
+const _PARSED_RATES_LIMIT = 4096;
 
 /**
- * Convert rate string to float.
+ * Parse a 'Material:Rate' or 'Material' string without consulting the memo.
  * 
  * Precondition:
- *     rate_str is a non-null string
- *     material is a non-null string (used for error messages)
+ *     text is a non-null string
  * 
  * Postcondition:
- *     returns float value of rate_str
+ *     returns [material_name, rate] as documented on parse_material_rate
  * 
- * @param {string} rate_str - string representation of a number
- * @param {string} material - material name (for error messages)
- * @returns {number} float value of rate_str
- * @throws {Error} if rate_str cannot be converted to float
+ * @param {string} text - string in format "Material:Rate" or "Material"
+ * @returns {[string, number]} [material_name, rate]
+ * @throws {Error} if rate is not a number
  */
-function _parse_rate_value(rate_str, material) {
-    const rate = parseFloat(rate_str);
-    if (isNaN(rate)) {
+function _parse_material_rate_uncached(text) {
+    // a single scan finds the separator for both the presence check and the split
+    const colon_index = text.indexOf(':');
+    if (colon_index === -1) {
+        // no colon means rate defaults to 0
+        return [text.trim(), 0];
+    }
+    const material = text.substring(0, colon_index).trim();
+    const rate_match = _RATE_PATTERN.exec(text.substring(colon_index + 1));
+    if (rate_match === null) {
+        const rate_str = text.substring(colon_index + 1).trim();
         throw new Error(
             `Invalid rate '${rate_str}' for ${material}. Must be a number.`
         );
     }
-    return rate;
+    // the pattern guarantees the captured text is a complete number
+    return [material, Number(rate_match[1])];
 }
 
 /**
@@ -72,6 +54,8 @@ function _parse_rate_value(rate_str, material) {
  * 
  * Postcondition:
  *     returns [material_name, rate] where material_name is trimmed and rate is a float
+ *     the rate is the leading number of the text after the colon; anything after it is ignored
+ *     results are memoized by text, so repeated lines skip the scan and conversion
  *     if no colon is present, rate defaults to 0, which means an unlimited amount of the material is available
  *
  * @param {string} text - string in format "Material:Rate" (e.g., "Iron Ore:120") or "Material" (e.g., "Iron Plate")
@@ -79,12 +63,32 @@ function _parse_rate_value(rate_str, material) {
  * @throws {Error} if format is invalid or rate is not a number
  */
 export function parse_material_rate(text) {
-    if (!text.includes(':')) {
-        // no colon means rate defaults to 0
-        return [text.trim(), 0];
+    let parsed = _PARSED_RATES.get(text);
+    if (parsed === undefined) {
+        parsed = _parse_material_rate_uncached(text);
+        if (_PARSED_RATES.size >= _PARSED_RATES_LIMIT) {
+            // bound memory for unusual inputs by starting over
+            _PARSED_RATES.clear();
+        }
+        _PARSED_RATES.set(text, parsed);
     }
-    const [material, rate_str] = _split_material_rate_string(text);
-    const rate = _parse_rate_value(rate_str, material);
-    return [material, rate];
+    // hand out a fresh tuple so callers cannot corrupt the memo
+    return [parsed[0], parsed[1]];
 }
 
+/**
+ * Parse many 'Material:Rate' or 'Material' strings in one call.
+ * 
+ * Precondition:
+ *     texts is an array of non-null strings, each accepted by parse_material_rate
+ * 
+ * Postcondition:
+ *     returns one [material_name, rate] tuple per text, in the same order
+ *
+ * @param {Array<string>} texts - strings in format "Material:Rate" or "Material"
+ * @returns {Array<[string, number]>} [material_name, rate] for each text
+ * @throws {Error} if any text has a rate that is not a number
+ */
+export function parse_material_rates(texts) {
+    return texts.map(text => parse_material_rate(text));
+}
@@ -48,11 +48,41 @@ class Recipe {
      * @param {string} machine - machine type name
      * @param {Object<string, number>} inputs - dict mapping material names to amounts per minute
      * @param {Object<string, number>} outputs - dict mapping material names to amounts per minute
+     * @param {string|null} name - recipe name, set for recipes loaded from the game data
      */
-    constructor(machine, inputs, outputs) {
+    constructor(machine, inputs, outputs, name = null) {
         this.machine = machine;
         this.inputs = inputs;
         this.outputs = outputs;
+        this.name = name;
+    }
+}
+
+/**
+ * A Set that rejects modification after construction, so shared module-level
+ * sets can be handed out without copying.
+ */
+class _FrozenSet extends Set {
+    /**
+     * @param {Iterable<*>} values - values to hold
+     */
+    constructor(values) {
+        super();
+        for (const value of values) {
+            super.add(value);
+        }
+    }
+
+    add() {
+        throw new TypeError("Cannot modify a read-only set");
+    }
+
+    delete() {
+        throw new TypeError("Cannot modify a read-only set");
+    }
+
+    clear() {
+        throw new TypeError("Cannot modify a read-only set");
     }
 }
 
@@ -60,12 +90,13 @@ class Recipe {
 // Module-level data structures
 // ============================================================================
 
-// transformed recipe data in old format
-let _TRANSFORMED_RECIPES_DATA = {};
-
-// nested dict: output -> amount -> list of [machine, recipe_name]
+// dict: output -> list of [amount, machine, recipe_name] in load order
 const _BY_OUTPUT = {};
 
+// dict: output -> list of [amount, recipe_name, Recipe] ordered by amount,
+// highest first, ties in load order; Recipe has no power consumption in inputs
+const _RANKED_RECIPES_BY_OUTPUT = {};
+
 // dict: machine -> (recipe_name -> Recipe)
 const _BY_MACHINE = {};
 
@@ -75,8 +106,8 @@ const _ALL_PARTS = new Set();
 // dict: recipe_name -> Recipe
 const _ALL_RECIPES = {};
 
-// reverse lookup: Recipe -> recipe_name (using Map since objects are keys)
-const _RECIPE_NAMES = new Map();
+// dict: machine -> (recipe_name -> Recipe without power consumption in inputs)
+const _RECIPES_WITHOUT_POWER = {};
 
 // set of base parts (no recipe creates them)
 const _BASE_PARTS = new Set();
@@ -84,10 +115,15 @@ const _BASE_PARTS = new Set();
 // set of terminal parts (no recipe consumes them)
 const _TERMINAL_PARTS = new Set();
 
+// read-only copies of _BASE_PARTS and _TERMINAL_PARTS returned by the getters
+let _BASE_PARTS_VIEW = null;
+let _TERMINAL_PARTS_VIEW = null;
+
 // set of recipes enabled by default
 const _DEFAULT_ENABLEMENT_SET = new Set();
 
-// case-insensitive material name lookup: lowercase -> canonical name
+// case-insensitive material name lookup: lowercase -> canonical name,
+// built on first use by _get_material_name_lookup
 let _MATERIAL_NAME_LOOKUP = null;
 
 // schematic name to list of recipe names lookup
@@ -101,33 +137,23 @@ const _UNLISTED_RECIPES = new Set();
 // ============================================================================
 
 /**
- * Collect all input and output parts from a recipe into _ALL_PARTS.
+ * Collect a recipe's parts into _ALL_PARTS and add it to the _BY_OUTPUT index,
+ * touching each input and output once.
  * @param {Object<string, Object<string, number>>} recipe_data - raw recipe dict with "in" and "out" keys
- */
-function _collect_recipe_parts(recipe_data) {
-    for (const part of Object.keys(recipe_data.in)) {
-        _ALL_PARTS.add(part);
-    }
-    for (const part of Object.keys(recipe_data.out)) {
-        _ALL_PARTS.add(part);
-    }
-}
-
-/**
- * Add recipe to the _BY_OUTPUT index for each output material.
- * @param {Object<string, Object<string, number>>} recipe_data - raw recipe dict with "out" key
  * @param {string} machine - machine type name
  * @param {string} recipe_name - recipe name
  */
-function _index_recipe_outputs(recipe_data, machine, recipe_name) {
-    for (const [output, amount] of Object.entries(recipe_data.out)) {
+function _index_recipe_parts(recipe_data, machine, recipe_name) {
+    for (const part in recipe_data.in) {
+        _ALL_PARTS.add(part);
+    }
+    const outputs = recipe_data.out;
+    for (const output in outputs) {
+        _ALL_PARTS.add(output);
         if (!_BY_OUTPUT[output]) {
-            _BY_OUTPUT[output] = {};
-        }
-        if (!_BY_OUTPUT[output][amount]) {
-            _BY_OUTPUT[output][amount] = [];
+            _BY_OUTPUT[output] = [];
         }
-        _BY_OUTPUT[output][amount].push([machine, recipe_name]);
+        _BY_OUTPUT[output].push([outputs[output], machine, recipe_name]);
     }
 }
 
@@ -135,29 +161,45 @@ function _index_recipe_outputs(recipe_data, machine, recipe_name) {
  * Add machine power consumption to recipe inputs.
  * @param {Object<string, number>} inputs - recipe input materials
  * @param {string} machine - machine type name
- * @returns {Object<string, number>} inputs with power consumption added
+ * @returns {Object<string, number>} inputs with power consumption added, or inputs itself if the machine draws no power
  */
 function _add_power_consumption(inputs, machine) {
-    const result = { ...inputs };
-    if (machine in LOADS_DATA) {
-        result.MWm = (result.MWm || 0) + LOADS_DATA[machine];
+    const load = LOADS_DATA[machine];
+    if (load === undefined) {
+        // nothing to add, so share the input map rather than copying it
+        return inputs;
     }
-    return result;
+    return { ...inputs, MWm: (inputs.MWm || 0) + load };
 }
 
 /**
  * Create a Recipe object with power consumption added to inputs.
  * @param {string} machine - machine type name
+ * @param {string} recipe_name - recipe name
  * @param {Object<string, Object<string, number>>} recipe_data - raw recipe dict with "in" and "out" keys
  * @returns {Recipe} new Recipe object
  */
-function _create_recipe_object(machine, recipe_data) {
-    const inputs_with_power = _add_power_consumption(recipe_data.in, machine);
-    return new Recipe(machine, inputs_with_power, recipe_data.out);
+function _create_recipe_object(machine, recipe_name, recipe_data) {
+    const inputs_with_power = Object.freeze(_add_power_consumption(recipe_data.in, machine));
+    return new Recipe(machine, inputs_with_power, recipe_data.out, recipe_name);
+}
+
+/**
+ * Create and store the Recipe object without power consumption that
+ * get_recipes_for hands out.
+ * @param {string} machine - machine type name
+ * @param {string} recipe_name - recipe name
+ * @param {Object<string, Object<string, number>>} recipe_data - raw recipe dict with "in" and "out" keys
+ */
+function _register_recipe_without_power(machine, recipe_name, recipe_data) {
+    if (!_RECIPES_WITHOUT_POWER[machine]) {
+        _RECIPES_WITHOUT_POWER[machine] = {};
+    }
+    _RECIPES_WITHOUT_POWER[machine][recipe_name] = new Recipe(machine, recipe_data.in, recipe_data.out, recipe_name);
 }
 
 /**
- * Register recipe in _ALL_RECIPES, _RECIPE_NAMES, and _BY_MACHINE.
+ * Register recipe in _ALL_RECIPES and _BY_MACHINE.
  * @param {Recipe} recipe - Recipe object to register
  * @param {string} recipe_name - recipe name
  * @param {string} machine - machine type name
@@ -168,102 +210,103 @@ function _register_recipe(recipe, recipe_name, machine) {
     }
     _BY_MACHINE[machine][recipe_name] = recipe;
     _ALL_RECIPES[recipe_name] = recipe;
-    _RECIPE_NAMES.set(recipe, recipe_name);
 }
 
-function _is_miner_output(part) {
+/**
+ * Collect the names of all parts that some miner can extract.
+ * @returns {Set<string>} set of minable part names
+ */
+function _collect_miner_outputs() {
+    const miner_outputs = new Set();
     for (const miner of Object.values(RECIPES_DATA.miners)) {
         for (const resource of miner.allowedResources) {
-            if (RECIPES_DATA.items[resource].name === part) {
-                return true;
-            }
+            miner_outputs.add(RECIPES_DATA.items[resource].name);
         }
     }
+    return miner_outputs;
 }
 
 /**
- * Check if a part is a base part (has no recipe to create it).
- * @param {string} part - material name to check
- * @returns {boolean} true if part is a base part
+ * Classify all parts as base parts and/or terminal parts.
+ * 
+ * A part is a base part if no recipe creates it, a miner extracts it, or every
+ * recipe that creates it has no inputs. A part is terminal if no recipe consumes
+ * it. Both are decided from sets gathered in a single sweep over the recipes
+ * rather than rescanning every recipe for every part.
  */
-function _is_base_part(part) {
-    if (!(part in _BY_OUTPUT)) {
-        return true;
-    }
-    if (_is_miner_output(part)) {
-        return true;
-    }
-    // check if all recipes that output this part have no inputs
+function _classify_parts() {
+    const miner_outputs = _collect_miner_outputs();
+    const crafted = new Set();  // outputs of recipes that have inputs
+    const consumed = new Set();
     for (const recipe of Object.values(_ALL_RECIPES)) {
-        if (part in recipe.outputs) {
-            if (Object.keys(recipe.inputs).length > 0) {
-                return false;
+        let has_inputs = false;
+        for (const part in recipe.inputs) {
+            consumed.add(part);
+            has_inputs = true;
+        }
+        if (has_inputs) {
+            for (const part in recipe.outputs) {
+                crafted.add(part);
             }
         }
     }
-    return true;
-}
 
-/**
- * Check if a part is a terminal part (no recipe consumes it).
- * @param {string} part - material name to check
- * @returns {boolean} true if part is not consumed by any recipe
- */
-function _is_terminal_part(part) {
-    for (const recipe of Object.values(_ALL_RECIPES)) {
-        if (part in recipe.inputs) {
-            return false;
-        }
+    // after removing minable parts, crafted holds exactly the non-base parts;
+    // a part that no recipe creates was never added to it
+    for (const part of miner_outputs) {
+        crafted.delete(part);
     }
-    return true;
-}
 
-/**
- * Classify all parts as base parts and/or terminal parts.
- */
-function _classify_parts() {
     for (const part of _ALL_PARTS) {
-        if (_is_base_part(part)) {
+        if (!crafted.has(part)) {
             _BASE_PARTS.add(part);
         }
-        if (_is_terminal_part(part)) {
+        if (!consumed.has(part)) {
             _TERMINAL_PARTS.add(part);
         }
     }
 }
 
 /**
- * Check if a recipe should be enabled by default.
- * @param {Recipe} recipe - Recipe to check
- * @param {string} machine - machine type for this recipe
- * @returns {boolean} true if recipe doesn't output MWm and isn't from Packager
+ * Rank the recipes for each output by amount in _RANKED_RECIPES_BY_OUTPUT.
  */
-function _should_enable_recipe_by_default(recipe, machine) {
-    return !("MWm" in recipe.outputs) && machine !== "Packager" && machine !== "Converter";
+function _build_ranked_recipe_table() {
+    for (const [output, entries] of Object.entries(_BY_OUTPUT)) {
+        const ranked = [];
+        for (const [amount, machine, recipe_name] of entries) {
+            ranked.push([amount, recipe_name, _RECIPES_WITHOUT_POWER[machine][recipe_name]]);
+        }
+        // sort is stable, so equal amounts keep load order
+        ranked.sort((a, b) => b[0] - a[0]);
+        _RANKED_RECIPES_BY_OUTPUT[output] = ranked;
+    }
 }
 
 /**
- * Build the set of recipes enabled by default.
+ * Build the set of recipes enabled by default: everything except power
+ * generation and the Packager and Converter recipes.
  */
 function _build_default_enablement_set() {
-    for (const [machine, recipes] of Object.entries(_BY_MACHINE)) {
-        for (const [name, recipe] of Object.entries(recipes)) {
-            if (_should_enable_recipe_by_default(recipe, machine)) {
-                _DEFAULT_ENABLEMENT_SET.add(name);
-            }
+    for (const [name, recipe] of Object.entries(_ALL_RECIPES)) {
+        if (!("MWm" in recipe.outputs) && recipe.machine !== "Packager" && recipe.machine !== "Converter") {
+            _DEFAULT_ENABLEMENT_SET.add(name);
         }
     }
 }
 
 /**
- * Build case-insensitive material name lookup map.
+ * Get the case-insensitive material name lookup map, building it on first use.
+ * Only name normalization needs it, so module load does not pay for it.
+ * @returns {Map<string, string>} map from lowercase name to canonical name
  */
-function _build_material_name_lookup() {
-    _MATERIAL_NAME_LOOKUP = new Map();
-    
-    for (const part of _ALL_PARTS) {
-        _MATERIAL_NAME_LOOKUP.set(part.toLowerCase(), part);
+function _get_material_name_lookup() {
+    if (_MATERIAL_NAME_LOOKUP === null) {
+        _MATERIAL_NAME_LOOKUP = new Map();
+        for (const part of _ALL_PARTS) {
+            _MATERIAL_NAME_LOOKUP.set(part.toLowerCase(), part);
+        }
     }
+    return _MATERIAL_NAME_LOOKUP;
 }
 
 /**
@@ -371,10 +414,16 @@ function _build_schematic_recipes_lookup() {
  * @param {Object<string, Object<string, number>>} recipe_data - raw recipe dict with "in" and "out" keys
  */
 function _process_single_recipe(machine, recipe_name, recipe_data) {
-    _collect_recipe_parts(recipe_data);
-    _index_recipe_outputs(recipe_data, machine, recipe_name);
-    const recipe_obj = _create_recipe_object(machine, recipe_data);
+    // the raw input and output maps are shared by every Recipe built from this
+    // entry (and across machines), so freeze them instead of copying; they are
+    // built by _transform_recipes_data or copied by _merge_power_recipes, so
+    // the imported data modules stay untouched
+    Object.freeze(recipe_data.in);
+    Object.freeze(recipe_data.out);
+    _index_recipe_parts(recipe_data, machine, recipe_name);
+    const recipe_obj = _create_recipe_object(machine, recipe_name, recipe_data);
     _register_recipe(recipe_obj, recipe_name, machine);
+    _register_recipe_without_power(machine, recipe_name, recipe_data);
 }
 
 /**
@@ -444,7 +493,8 @@ function _transform_recipes_data() {
 
 /**
  * Merge power recipes into transformed data.
- * Power recipes are already in the old format.
+ * Power recipes are already in the old format. Their input and output maps are
+ * copied so that freezing them later does not freeze POWER_RECIPES_DATA itself.
  * @param {Object} transformed - transformed recipe data
  */
 function _merge_power_recipes(transformed) {
@@ -453,27 +503,45 @@ function _merge_power_recipes(transformed) {
             transformed[machine] = {};
         }
         for (const [recipe_name, recipe_data] of Object.entries(recipes)) {
-            transformed[machine][recipe_name] = recipe_data;
+            transformed[machine][recipe_name] = {
+                in: { ...recipe_data.in },
+                out: { ...recipe_data.out }
+            };
         }
     }
 }
 
+/**
+ * Make the recipe tables read-only once populated so the getters can hand
+ * them out directly instead of copying them on every call.
+ */
+function _freeze_recipe_tables() {
+    for (const recipes of Object.values(_BY_MACHINE)) {
+        Object.freeze(recipes);
+    }
+    Object.freeze(_BY_MACHINE);
+    Object.freeze(_ALL_RECIPES);
+}
+
 /**
  * Initialize all module-level lookup tables from recipe data.
  */
 function _populate_lookups() {
-    _TRANSFORMED_RECIPES_DATA = _transform_recipes_data();
-    _merge_power_recipes(_TRANSFORMED_RECIPES_DATA);
+    const transformed_recipes_data = _transform_recipes_data();
+    _merge_power_recipes(transformed_recipes_data);
     
-    for (const [machine, recipes] of Object.entries(_TRANSFORMED_RECIPES_DATA)) {
+    for (const [machine, recipes] of Object.entries(transformed_recipes_data)) {
         for (const [recipe_name, recipe_data] of Object.entries(recipes)) {
             _process_single_recipe(machine, recipe_name, recipe_data);
         }
     }
     
+    _freeze_recipe_tables();
     _classify_parts();
+    _BASE_PARTS_VIEW = new _FrozenSet(_BASE_PARTS);
+    _TERMINAL_PARTS_VIEW = new _FrozenSet(_TERMINAL_PARTS);
+    _build_ranked_recipe_table();
     _build_default_enablement_set();
-    _build_material_name_lookup();
     _build_schematic_recipes_lookup();
 }
 
@@ -531,22 +599,18 @@ function get_load(machine) {
 
 /**
  * Get all recipes grouped by machine type.
- * @returns {Object<string, Object<string, Recipe>>} dict mapping machine names to recipe dicts
+ * @returns {Object<string, Object<string, Recipe>>} read-only dict mapping machine names to read-only recipe dicts
  */
 function get_all_recipes_by_machine() {
-    const result = {};
-    for (const [machine, recipes] of Object.entries(_BY_MACHINE)) {
-        result[machine] = { ...recipes };
-    }
-    return result;
+    return _BY_MACHINE;
 }
 
 /**
  * Get all recipes by name.
- * @returns {Object<string, Recipe>} dict mapping recipe names to Recipe objects
+ * @returns {Object<string, Recipe>} read-only dict mapping recipe names to Recipe objects
  */
 function get_all_recipes() {
-    return { ..._ALL_RECIPES };
+    return _ALL_RECIPES;
 }
 
 /**
@@ -559,19 +623,12 @@ function _is_recipe_enabled(recipe_name, enablement_set) {
     return !enablement_set || enablement_set.has(recipe_name);
 }
 
-/**
- * Create a Recipe object from raw JSON data without power consumption.
- * @param {string} machine - machine type name
- * @param {string} recipe_name - recipe name
- * @returns {Recipe} new Recipe object without power consumption in inputs
- */
-function _create_recipe_from_raw(machine, recipe_name) {
-    const raw_recipe = _TRANSFORMED_RECIPES_DATA[machine][recipe_name];
-    return new Recipe(machine, raw_recipe.in, raw_recipe.out);
-}
-
 /**
  * Get all recipes that produce a given output material.
+ * 
+ * Recipe objects are built once at load and shared between calls; only the
+ * enablement filtering and grouping are redone per call, since enablement sets
+ * are mutable and cannot be used as cache keys.
  * @param {string} output - output material name
  * @param {Set<string>|null} enablement_set - set of enabled recipe names or null for all enabled
  * @returns {Object<number, Array<[string, Recipe]>>} dict mapping production amounts to arrays of [recipe_name, recipe] tuples
@@ -583,15 +640,12 @@ function get_recipes_for(output, enablement_set = null) {
         return results;
     }
     
-    for (const [amount, machine_recipe_name_pairs] of Object.entries(_BY_OUTPUT[output])) {
-        for (const [machine, recipe_name] of machine_recipe_name_pairs) {
-            if (_is_recipe_enabled(recipe_name, enablement_set)) {
-                const recipe = _create_recipe_from_raw(machine, recipe_name);
-                if (!results[amount]) {
-                    results[amount] = [];
-                }
-                results[amount].push([recipe_name, recipe]);
+    for (const [amount, machine, recipe_name] of _BY_OUTPUT[output]) {
+        if (_is_recipe_enabled(recipe_name, enablement_set)) {
+            if (!results[amount]) {
+                results[amount] = [];
             }
+            results[amount].push([recipe_name, _RECIPES_WITHOUT_POWER[machine][recipe_name]]);
         }
     }
     return results;
@@ -602,13 +656,20 @@ function get_recipes_for(output, enablement_set = null) {
  * @param {string} output - output material name
  * @param {Set<string>|null} enablement_set - set of enabled recipe names or null for all enabled
  * @returns {[number, string, Recipe]} tuple of [amount, recipe_name, recipe]
+ * @throws {Error} if no enabled recipe produces the output
  */
 function get_recipe_for(output, enablement_set = null) {
-    const recipes_for_output = get_recipes_for(output, enablement_set);
-    const amounts = Object.keys(recipes_for_output).map(Number);
-    const max_amount = Math.max(...amounts);
-    const recipes = recipes_for_output[max_amount];
-    return [max_amount, recipes[0][0], recipes[0][1]];
+    // recipes are pre-ranked, so the first enabled one is the answer; with
+    // everything enabled that is the first entry
+    const ranked = _RANKED_RECIPES_BY_OUTPUT[output];
+    if (ranked !== undefined) {
+        for (const [amount, recipe_name, recipe] of ranked) {
+            if (_is_recipe_enabled(recipe_name, enablement_set)) {
+                return [amount, recipe_name, recipe];
+            }
+        }
+    }
+    throw new Error(`No enabled recipe produces ${output}`);
 }
 
 /**
@@ -617,39 +678,45 @@ function get_recipe_for(output, enablement_set = null) {
  * @returns {string|undefined} recipe name or undefined if not found
  */
 function find_recipe_name(recipe) {
-    return _RECIPE_NAMES.get(recipe);
+    // recipes built outside the loaded game data carry no name
+    return recipe.name === null ? undefined : recipe.name;
 }
 
 /**
  * Get all base materials (materials with no crafting recipe).
- * @returns {Set<string>} set of base material names
+ * @returns {Set<string>} shared read-only set of base material names
  */
 function get_base_parts() {
-    return new Set(_BASE_PARTS);
+    return _BASE_PARTS_VIEW;
 }
 
 /**
  * Get all terminal materials (materials not consumed by any recipe).
- * @returns {Set<string>} set of terminal material names
+ * @returns {Set<string>} shared read-only set of terminal material names
  */
 function get_terminal_parts() {
-    return new Set(_TERMINAL_PARTS);
+    return _TERMINAL_PARTS_VIEW;
 }
 
 /**
  * Get the default set of enabled recipes.
+ * Unlike the part sets this returns a fresh copy, since callers use it as
+ * their own mutable enablement state.
  * @returns {Set<string>} set of default enabled recipe names
  */
 function get_default_enablement_set() {
     return new Set(_DEFAULT_ENABLEMENT_SET);
 }
 
+// fluid names in data order, shared by every get_fluids call
+const _FLUID_NAMES = Object.freeze(Object.keys(FLUIDS_DATA));
+
 /**
  * Get all fluid material names.
- * @returns {Array<string>} array of fluid names
+ * @returns {ReadonlyArray<string>} shared read-only array of fluid names
  */
 function get_fluids() {
-    return Object.keys(FLUIDS_DATA);
+    return _FLUID_NAMES;
 }
 
 /**
@@ -668,9 +735,10 @@ function get_fluid_color(fluid) {
  */
 function normalize_material_names(materials) {
     const normalized = {};
+    const name_lookup = _get_material_name_lookup();
     
     for (const [material, value] of Object.entries(materials)) {
-        const canonical = _MATERIAL_NAME_LOOKUP.get(material.toLowerCase());
+        const canonical = name_lookup.get(material.toLowerCase());
         if (canonical) {
             normalized[canonical] = value;
         } else {
@@ -689,9 +757,10 @@ function normalize_material_names(materials) {
  */
 function normalize_input_array(inputs) {
     const normalized = [];
+    const name_lookup = _get_material_name_lookup();
     
     for (const [material, rate] of inputs) {
-        const canonical = _MATERIAL_NAME_LOOKUP.get(material.toLowerCase());
+        const canonical = name_lookup.get(material.toLowerCase());
         if (canonical) {
             normalized.push([canonical, rate]);
         } else {
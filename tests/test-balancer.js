@@ -178,4 +178,12 @@ describe('Balancer', () => {
             throw new Error("Missing direct I0 -> O0 connection");
         }
     });
+
+    it('parallel chains connect each input directly to its output', () => {
+        const g = design_balancer([60, 40], [60, 40]);
+        const [s, m] = count_devices(g.source);
+        assert.strictEqual(s + m, 0);
+        assert.ok(g.source.includes('I0 -> O0 [label="60"]'));
+        assert.ok(g.source.includes('I1 -> O1 [label="40"]'));
+    });
 });
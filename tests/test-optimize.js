@@ -210,5 +210,29 @@ describe('Optimize', () => {
         );
         assert.strictEqual(actual["Alternate: Compacted Coal"] > 0, true);
     });
-    
+
+    it('test_part_consumed_and_produced_uses_net_amount: recipe recycling a part only counts its net production', async () => {
+        // Encased Uranium Cell consumes 40 Sulfuric Acid and produces 10 per machine,
+        // so each machine needs 30 Sulfuric Acid from the inputs
+        const actual = await optimize_recipes(
+            {"Sulfuric Acid": 60, "Concrete": 30},
+            {"Encased Uranium Cell": 50},
+            {enablement_set: new Set(["Encased Uranium Cell"]), economy: {}}
+        );
+        assert.strictEqual(actual["Encased Uranium Cell"], 2);
+
+        try {
+            await optimize_recipes(
+                {"Sulfuric Acid": 30, "Concrete": 30},
+                {"Encased Uranium Cell": 50},
+                {enablement_set: new Set(["Encased Uranium Cell"]), economy: {}}
+            );
+            throw new Error('Should have thrown an error');
+        } catch (e) {
+            if (!e.message.includes("Couldn't design the factory")) {
+                throw new Error(`Expected error about infeasible factory, got: ${e.message}`);
+            }
+        }
+    });
+
 });
@@ -1,6 +1,6 @@
 import { describe, it } from 'node:test';
 import assert from 'node:assert/strict';
-import { parse_material_rate } from '../parsing-utils.js';
+import { parse_material_rate, parse_material_rates } from '../parsing-utils.js';
 
 describe('Parsing Utils', () => {
     it('parse_material_rate parses valid input', () => {
@@ -53,6 +53,22 @@ describe('Parsing Utils', () => {
         );
     });
 
+    it('parse_material_rate ignores text after a leading number', () => {
+        assert.deepStrictEqual(parse_material_rate('Iron Ore:120/min'), ['Iron Ore', 120]);
+        assert.deepStrictEqual(parse_material_rate('Water:Infinity'), ['Water', Infinity]);
+    });
+
+    it('parse_material_rate accepts exponent and bare fraction rates', () => {
+        assert.deepStrictEqual(parse_material_rate('Iron Ore:1.2e2'), ['Iron Ore', 120]);
+        assert.deepStrictEqual(parse_material_rate('Water:.5'), ['Water', 0.5]);
+    });
+
+    it('parse_material_rate returns an independent tuple for repeated text', () => {
+        const first = parse_material_rate('Limestone:90');
+        first[1] = 0;
+        assert.deepStrictEqual(parse_material_rate('Limestone:90'), ['Limestone', 90]);
+    });
+
     // Tests ported from test_parsing_utils.py
 
     it('test_parse_material_rate_basic: should parse basic Material:Rate strings', () => {
@@ -110,4 +126,16 @@ describe('Parsing Utils', () => {
         assert.strictEqual(material, "Power");
         assert.strictEqual(rate, -100);
     });
+
+    it('parse_material_rates parses each line in order', () => {
+        const items = parse_material_rates(['Iron Ore:120', '  Water : 37.5 ', 'Coal']);
+        assert.deepStrictEqual(items, [['Iron Ore', 120], ['Water', 37.5], ['Coal', 0]]);
+    });
+
+    it('parse_material_rates throws on any invalid rate', () => {
+        assert.throws(
+            () => parse_material_rates(['Iron Ore:120', 'Copper Ore:abc']),
+            /Invalid rate 'abc' for Copper Ore/
+        );
+    });
 });
@@ -21,6 +21,7 @@ import {
     _SCHEMATIC_RECIPES_LOOKUP,
     _UNLISTED_RECIPES
 } from '../recipes.js';
+import { POWER_RECIPES_DATA } from '../data/power-recipes-data.js';
 
 describe('Recipes', () => {
     it('get_conveyor_rate(0) returns 60', () => {
@@ -117,6 +118,21 @@ describe('Recipes', () => {
         if (!fluids.includes('Crude Oil')) throw new Error('Missing Crude Oil in fluids');
     });
     
+    it('get_fluids() returns the same read-only array on every call', () => {
+        const fluids = get_fluids();
+        assert.strictEqual(get_fluids(), fluids);
+        assert.ok(Object.isFrozen(fluids));
+    });
+    
+    it('loading recipes leaves the imported power recipe data unfrozen', () => {
+        for (const recipes of Object.values(POWER_RECIPES_DATA)) {
+            for (const recipe_data of Object.values(recipes)) {
+                assert.ok(!Object.isFrozen(recipe_data.in));
+                assert.ok(!Object.isFrozen(recipe_data.out));
+            }
+        }
+    });
+    
     it('get_fluid_color("Water") returns hex color', () => {
         const color = get_fluid_color("Water");
         if (!color.startsWith('#')) throw new Error('Color does not start with #');
@@ -204,6 +220,22 @@ describe('Recipes', () => {
         assert.strictEqual(recipe_name, sample_recipe_name);
     });
 
+    it('get_recipe_for matches the highest amount from get_recipes_for', () => {
+        const all_recipes = get_recipes_for("Iron Ingot");
+        const max_amount = Math.max(...Object.keys(all_recipes).map(Number));
+        const [amount, recipe_name, recipe] = get_recipe_for("Iron Ingot");
+        assert.strictEqual(amount, max_amount);
+        assert.strictEqual(recipe_name, all_recipes[max_amount][0][0]);
+        assert.strictEqual(recipe, all_recipes[max_amount][0][1]);
+    });
+
+    it('get_recipe_for throws when no enabled recipe produces the output', () => {
+        assert.throws(
+            () => get_recipe_for("Iron Ingot", new Set(["Iron Plate"])),
+            /No enabled recipe produces Iron Ingot/
+        );
+    });
+
     it('test_find_recipe_name: should locate recipe by its Recipe object', () => {
         // find_recipe_name requires Recipe objects created from the internal lookups
         const all_recipes = get_all_recipes();
@@ -223,6 +255,20 @@ describe('Recipes', () => {
         assert.strictEqual(found_name, recipe_name);
     });
 
+    it('find_recipe_name reads the name stored on loaded recipes', () => {
+        const [amount, recipe_name, recipe] = get_recipe_for("Iron Plate");
+        assert.strictEqual(find_recipe_name(recipe), recipe_name);
+        assert.strictEqual(find_recipe_name(new Recipe("Constructor", {}, {})), undefined);
+    });
+
+    it('get_base_parts returns a shared set that cannot be modified', () => {
+        const base_parts = get_base_parts();
+        assert.strictEqual(get_base_parts(), base_parts);
+        assert.throws(() => base_parts.add("Iron Plate"), TypeError);
+        assert.throws(() => base_parts.delete("Iron Ore"), TypeError);
+        assert.ok(base_parts.has("Iron Ore"));
+    });
+
     it('test_get_terminal_parts: terminal parts should be products with no consumers', () => {
         const terminal_parts = get_terminal_parts();
         